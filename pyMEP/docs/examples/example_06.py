@@ -0,0 +1,58 @@
+"""
+EXAMPLE 6
+---------
+Calculate the cooling load of a building with several identical office zones,
+evaluated concurrently.
+"""
+from pyMEP import Quantity
+from pyMEP.hvac.climatic import WeatherData, ReferenceDates
+from pyMEP.hvac.external_heat_gains import *
+from pyMEP.hvac.internal_heat_gains import LightingHeatGain, PeopleHeatGain
+from pyMEP.hvac.lighting import SpaceLighting, LightingPowerDensities
+from pyMEP.hvac.zone import Zone, Building
+
+Q_ = Quantity
+
+weather_data_01 = WeatherData.create_from_climatic_design_data(
+    ID='Atlanta USA',
+    fi = Q_(33.640, 'deg'),
+    L_loc = Q_(-84.4, 'deg'),
+    altitude = Q_(313, 'feet').to('m'),
+    date = ReferenceDates.get_date_for('jul'),
+    T_db_des = Q_(33.1, 'degC'),
+    T_db_rng = Q_(9.3, 'delta_degC'),
+    T_wb_mc = Q_(23.2, 'degC'),
+    T_wb_rng = Q_(3.4, 'delta_degC'),
+    taub = 0.515,
+    taud = 2.066,
+    tz=-5
+)
+weather_data_01.update_sun_position()
+
+def office_zone(ID: str, azimuth: Quantity) -> Zone:
+    zone = Zone(ID, weather_data=weather_data_01, room_construction='Medium', carpet='With Carpet', glass='50%')
+    wall = Wall.creat_external_wall(ID + '.Wall',
+                                    weather_data = weather_data_01,
+                                    surface_azimuth = azimuth,
+                                    gross_area = Q_(14, 'm ** 2'),
+                                    U = Q_(0.44, 'W / (m**2 * K)'),
+                                    CTS = [18,57,20,4,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0],
+                                    NS_RTS = None)
+    win = wall.add_window(id=ID + '.Win', width=Q_(3.0, 'm'), height=Q_(1.5, 'm'), U=3.18, SC=0.9)
+    win.SHGCd = [0.81, 0.80, 0.78, 0.73, 0.62, 0.39, 0]
+    win.SHGCh = 0.73
+    zone.add_element(wall)
+    lighting = LightingHeatGain(ID=ID + '.Lighting')
+    lpd = Q_(LightingPowerDensities(space_type='Office', category='Enclosed'), 'W / m ** 2')
+    lighting.add_lighting(SpaceLighting.create(ID='ls0', power_density=lpd, floor_area=Q_(20, 'm ** 2'), schedule=lighting.usage_schedule))
+    zone.add_internal_gain(lighting)
+    zone.add_internal_gain(PeopleHeatGain(ID + '.People'))
+    return zone
+
+if __name__ == '__main__':
+    building = Building('Office Tower')
+    for floor in range(10):
+        for i, azimuth in enumerate((-90, 0, 90, 180)):
+            building.add_zone(office_zone(f'L{floor:02d}-{i}', Q_(azimuth, 'deg')))
+    print(building.update_cooling_load())
+    print(f'Peak building load @{building.peak_hour} Hour = {building.peak_load.to("kW"):0.1f}')
@@ -1,5 +1,9 @@
 ﻿from __future__ import annotations
+import os
+import copy
+from typing import Iterable, Iterator
 import pandas as pd
+from CoolProp.HumidAirProp import HAPropsSI
 from datetime import date as Date
 from .. import Quantity
 from .time import *
@@ -90,6 +94,13 @@ class WeatherData:
 		self._timezone: str = 'Asia/Bangkok'
 		self._climate_type: str = ClimateType.TROPICAL
 		self.position_df: pd.DataFrame | None = None
+		# hourly (annual) mode, see `create_from_hourly_data`
+		self.timestamps: np.ndarray | None = None
+		self.Eb_prof: np.ndarray | None = None
+		self.Ed_prof: np.ndarray | None = None
+		# every 24 hours of `timestamps` are one periodic design day, see `design_day_sweep`
+		self.design_days: bool = False
+		self._sun_inputs: tuple | None = None
 
 	@classmethod
 	def create_from_climatic_design_data(cls, ID: str,
@@ -168,6 +179,94 @@ class WeatherData:
 		obj.synthetic_daily_wb_profiles()
 		return obj
 
+	@classmethod
+	def create_from_hourly_data(cls, ID: str,
+								fi: Quantity,
+								L_loc: Quantity,
+								altitude: Quantity,
+								T_db: Quantity,
+								T_wb: Quantity | None = None,
+								start: Date = Date(2024, 1, 1),
+								Eb: np.ndarray | None = None,
+								Ed: np.ndarray | None = None,
+								taub: float | np.ndarray = 0,
+								taud: float | np.ndarray = 0,
+								tz: int = 7,
+								timezone: str = 'Asia/Bangkok',
+								climate_type: str = ClimateType.TROPICAL) -> WeatherData:
+		"""Creates `WeatherData` object from hourly weather data (e.g. a full year
+		of 8760 hours) instead of a single synthetic design day.
+
+		Parameters
+		----------
+		fi, L_loc, altitude, tz, timezone, climate_type:
+			See `create_from_climatic_design_data`.
+		T_db:
+			Hourly dry-bulb temperatures (Quantity array), the first value at
+			00:00 local standard time of `start`.
+		T_wb:
+			Hourly wet-bulb temperatures (Quantity array), optional.
+		start:
+			Date of the first hour.
+		Eb, Ed:
+			Measured hourly beam normal and diffuse horizontal irradiance in
+			W/m2. If None, the ASHRAE clear-sky model is used with `taub` and `taud`.
+		taub, taud:
+			Clear-sky optical depths; a single value or one value per hour.
+		"""
+		obj = cls()
+		obj.ID = ID
+		obj._fi = fi.to('rad')
+		obj._L_loc = L_loc
+		obj._altitude = altitude
+		obj._date = start
+		obj._taub = taub
+		obj._taud = taud
+		obj._tz = tz
+		obj._timezone = timezone
+		obj._climate_type = climate_type
+		obj.T_db_prof = T_db.to('degC')
+		obj.T_wb_prof = T_wb.to('degC') if T_wb is not None else None
+		obj.timestamps = np.datetime64(start, 'h') + np.arange(len(obj.T_db_prof)).astype('timedelta64[h]')
+		obj.Eb_prof = np.asarray(Eb, dtype=float) if Eb is not None else None
+		obj.Ed_prof = np.asarray(Ed, dtype=float) if Ed is not None else None
+		return obj
+
+	def design_day_sweep(self, months: Iterable[str | int] | None = None,
+						 T_db_des: Iterable[Quantity] | None = None) -> WeatherData:
+		"""Returns a `WeatherData` holding the design day of each month in `months`
+		(`ReferenceDates`, all 12 months if None) back to back, so that the sun
+		positions, irradiances and cooling loads of all months are calculated in
+		one pass over a (months × 24 hours) grid. Each day stays a periodic
+		design day (`design_days` is True).
+
+		Parameters
+		----------
+		months:
+			Month names or numbers.
+		T_db_des:
+			Monthly design dry-bulb temperature of each month; if None the
+			temperature profiles of this design day are used for every month.
+		"""
+		if self.timestamps is not None:
+			raise ValueError('design day sweep requires design day weather data')
+		months = list(ReferenceDates.months()) if months is None else list(months)
+		dates = np.array([ReferenceDates.get_date_for(m) for m in months], dtype='datetime64[D]')
+		obj = copy.copy(self)
+		obj._date = ReferenceDates.get_date_for(months[0])
+		obj.timestamps = (dates[:, None] + np.arange(24).astype('timedelta64[h]')).ravel()
+		obj.design_days = True
+		obj.position_df = None
+		if T_db_des is None:
+			obj.T_db_prof = Q_(np.tile(self.T_db_array, len(months)), 'degC')
+		else:
+			T_db_des = np.array([T.to('degC').m for T in T_db_des])
+			T_db_rng = self.T_db_rng.to('delta_degC').m
+			obj.T_db_prof = Q_((T_db_des[:, None] - np.array(daily_temp_rng_fractions)[None, :] * T_db_rng).ravel(), 'degC')
+		if self.T_wb_prof is not None:
+			obj.T_wb_prof = Q_(np.tile(self.T_wb_array, len(months)), 'degC')
+		return obj
+
 	# property & Setter
 	# region
 	@property
@@ -207,6 +306,15 @@ class WeatherData:
 		"""Set the current date at the location."""
 		self._date = date
 
+	@property
+	def schedule_start(self) -> Date | None:
+		"""Date of the first hour of hourly (e.g. annual) weather data, from
+		which usage schedules are evaluated with their weekday, weekend and
+		holiday profiles; None for design days, which use the weekday profile."""
+		if self.timestamps is None or self.design_days:
+			return None
+		return self._date
+
 	@property
 	def T_db_des(self) -> Quantity:
 		return self._T_db_des
@@ -265,6 +373,31 @@ class WeatherData:
 	def taud(self, v: float) -> None:
 		self._taud = v
 
+	@property
+	def T_db_array(self) -> np.ndarray:
+		"""Outdoor dry-bulb temperature profile as an array in degC."""
+		return _magnitudes(self.T_db_prof, 'degC')
+
+	@property
+	def T_wb_array(self) -> np.ndarray:
+		"""Outdoor wet-bulb temperature profile as an array in degC."""
+		return _magnitudes(self.T_wb_prof, 'degC')
+
+	@property
+	def pressure(self) -> Quantity:
+		"""Standard atmospheric pressure at the altitude of the location
+		(ASHRAE Fundamentals 2021 Chapter 1 Eq. 3); sea level if no altitude is set."""
+		Z = self.altitude.to('m').m if self.altitude is not None else 0.0
+		return Q_(101.325 * (1 - 2.25577e-5 * Z) ** 5.2559, 'kPa')
+
+	@property
+	def W_array(self) -> np.ndarray:
+		"""Outdoor humidity ratio profile as an array in kg/kg (dry air), from the
+		dry-bulb and wet-bulb temperature profiles at `pressure`, see `humidity_ratio`."""
+		if self.T_wb_prof is None:
+			raise ValueError(f'weather data {self.ID!r} has no wet-bulb temperatures (T_wb); they are needed for the outdoor humidity ratio')
+		return humidity_ratio(self.T_db_array, self.pressure.to('Pa').m, T_wb=self.T_wb_array)
+
 	@property
 	def T_db_max(self) -> Quantity:
 		return max(self.T_db_prof)
@@ -300,13 +433,41 @@ class WeatherData:
 		according to ASHRAE Handbook-Fundamentals 2021 p14.12, Temperatures."""
 		self.T_wb_prof = [wet_bulb_temperature(t_sol_dec, self.T_wb_mc, self.T_wb_rng) for t_sol_dec in range(0, 24)]
 
-	def update_sun_position(self, lst: float | np.ndarray = np.array([i for i in range(24)])) -> pd.DataFrame:
+	def sun_position_inputs(self) -> tuple:
+		"""The values `update_sun_position` depends on; arrays are held by
+		reference (see `sun_position_outdated`)."""
+		return (self.date, self.fi, self.L_loc, self.tz, self.taub, self.taud,
+				self.timestamps, self.Eb_prof, self.Ed_prof)
+
+	@property
+	def sun_position_outdated(self) -> bool:
+		"""True if `position_df` is missing or was calculated for other inputs (date,
+		location, time zone, optical depths, hourly data). Arrays count as changed
+		when they are replaced by another array object."""
+		if self.position_df is None or self._sun_inputs is None:
+			return True
+		return not all(_same_input(a, b) for a, b in zip(self._sun_inputs, self.sun_position_inputs()))
+
+	def update_sun_position(self, lst: float | np.ndarray | None = None) -> pd.DataFrame:
 		"""Update Sun Position (AST, Hour Angle, Altitude, Aziuth, Air Mass etc. of the sun).
 		ASHRAE Handbook-Fundamentals 2021 p14.10
 		All expressed in degrees
+
+		By default the 24 hours of `date` are calculated; with hourly weather data
+		(see `create_from_hourly_data`) every hour of the data is calculated.
 		"""
+		if self.timestamps is None:
+			lst = np.array([i for i in range(24)]) if lst is None else lst
+			dates = day_number(self.date)
+			_declination = self.declination.m
+		else:
+			days = self.timestamps.astype('datetime64[D]')
+			lst = (self.timestamps - days).astype(int).astype(float)
+			dates = (days - days.astype('datetime64[Y]')).astype(int) + 1
+			_declination = declination(dates)
 		df = pd.DataFrame(lst, columns=['LST'])
-		dates = day_number(self.date)
+		if self.timestamps is not None:
+			df.insert(loc=0, column='Time', value=self.timestamps)
 
 		# AST : Apparent Solar Ttime
 		AST = apparent_solar_time(LST=lst, n=dates, LON=self.L_loc, TZ=self.tz)
@@ -317,7 +478,6 @@ class WeatherData:
 		df['H'] = H
 
 		# Solar Altitude
-		_declination = self.declination.m
 		fi = self.fi.m
 		beta = np.arcsin(np.cos(fi)*np.cos(_declination)*np.cos(np.deg2rad(H)) + np.sin(fi)*np.sin(_declination))
 		df['Altitude'] = np.rad2deg(beta)
@@ -327,7 +487,7 @@ class WeatherData:
 		afternoon = AST.copy()
 		afternoon[afternoon < 12] = -1
 		afternoon[afternoon != -1] = 1
-		phi = np.arccos((np.sin(beta)*np.sin(fi) - np.sin(_declination))/(np.cos(beta)*np.cos(fi)))
+		phi = np.arccos(np.clip((np.sin(beta)*np.sin(fi) - np.sin(_declination))/(np.cos(beta)*np.cos(fi)), -1, 1))
 		phi = phi * afternoon
 		df['Azimuth'] = np.rad2deg(phi)
 
@@ -345,15 +505,66 @@ class WeatherData:
 		ad = 0.507 + 0.205*self.taub - 0.080*self.taud - 0.190*self.taub*self.taud
 
 		E0 = ext_irradiance_normal(dates)
-		Eb = E0 * np.exp(-self.taub * (m ** ab))
+		with np.errstate(under='ignore'):
+			Eb = E0 * np.exp(-self.taub * (m ** ab))
+			Ed = E0 * np.exp(-self.taud * (m ** ad))
 		Eb[Eb == E0] = 0
-		Ed = E0 * np.exp(-self.taud * (m ** ad))
 		Ed[Ed == E0] = 0
+		if self.Eb_prof is not None:
+			Eb = self.Eb_prof
+		if self.Ed_prof is not None:
+			Ed = self.Ed_prof
 		df['Eb(W/m2)'] = Eb
 		df['Ed(W/m2)'] = Ed
 		self.position_df = df
+		self._sun_inputs = self.sun_position_inputs()
 		return df
 
+def _same_input(a, b) -> bool:
+	"""Arrays (also inside a Quantity) are the same input if they are the same
+	object, other values if they are equal."""
+	if isinstance(getattr(a, 'magnitude', a), np.ndarray) or isinstance(getattr(b, 'magnitude', b), np.ndarray):
+		return a is b
+	return bool(a == b)
+
+def _magnitudes(profile: list[Quantity] | Quantity | None, unit: str) -> np.ndarray | None:
+	"""Magnitudes of a temperature profile, stored as a list of Quantities
+	(design day) or as one Quantity array (hourly data)."""
+	if profile is None:
+		return None
+	if isinstance(profile, Quantity):
+		return np.asarray(profile.to(unit).m, dtype=float)
+	return np.array([T.to(unit).m for T in profile])
+
+def saturation_pressure(T: float | np.ndarray) -> np.ndarray:
+	"""Saturation pressure of water vapor in Pa at temperature `T` in degC, over
+	ice below 0 °C and over liquid water above (ASHRAE Fundamentals 2021,
+	Chapter 1, Eq. 5 and 6)."""
+	T = np.asarray(T, dtype=float) + 273.15
+	ice = -5.6745359e3 / T + 6.3925247 - 9.6778430e-3 * T + 6.2215701e-7 * T**2 + 2.0747825e-9 * T**3 - 9.4840240e-13 * T**4 + 4.1635019 * np.log(T)
+	water = -5.8002206e3 / T + 1.3914993 - 4.8640239e-2 * T + 4.1764768e-5 * T**2 - 1.4452093e-8 * T**3 + 6.5459673 * np.log(T)
+	return np.exp(np.where(T < 273.15, ice, water))
+
+def humidity_ratio(T_db: float | np.ndarray, P: float, T_wb: float | np.ndarray | None = None, RH: float | np.ndarray | None = None) -> np.ndarray:
+	"""Humidity ratio in kg/kg (dry air) of moist air at dry-bulb temperature
+	`T_db` in degC and pressure `P` in Pa, from the thermodynamic wet-bulb
+	temperature `T_wb` in degC (ASHRAE Fundamentals 2021, Chapter 1, Eq. 33 and
+	35; limited to `T_db`, and to dry air for inconsistent inputs) or from the
+	relative humidity `RH` (0-1, Eq. 22).
+	Arrays of any number of hours are evaluated in one pass."""
+	T_db = np.asarray(T_db, dtype=float)
+	if T_wb is None and RH is None:
+		raise ValueError('humidity_ratio needs the wet-bulb temperature T_wb or the relative humidity RH')
+	if T_wb is None:
+		p_w = np.asarray(RH, dtype=float) * saturation_pressure(T_db)
+		return 0.621945 * p_w / (P - p_w)
+	T_wb = np.minimum(np.asarray(T_wb, dtype=float), T_db)
+	p_ws = saturation_pressure(T_wb)
+	W_s = 0.621945 * p_ws / (P - p_ws)
+	water = ((2501 - 2.326 * T_wb) * W_s - 1.006 * (T_db - T_wb)) / (2501 + 1.86 * T_db - 4.186 * T_wb)
+	ice = ((2830 - 0.24 * T_wb) * W_s - 1.006 * (T_db - T_wb)) / (2830 + 1.86 * T_db - 2.1 * T_wb)
+	return np.maximum(np.where(T_wb < 0, ice, water), 0.0)
+
 def dry_bulb_temperature(t_sol_dec: float, T_db_des: Quantity, T_db_rng: Quantity) -> Quantity:
 	"""Returns the dry-bulb temperature at `t_sol_dec`, calculated according to
 	ASHRAE Handbook-Fundamentals 2021 p14.12, Temperatures.
@@ -393,3 +604,200 @@ def wet_bulb_temperature(t_sol_dec: float, T_wb_mc: Quantity, T_wb_rng: Quantity
 	frac = daily_temp_rng_fractions[t_sol_hr]
 	T_wb = T_wb_mc - frac * T_wb_rng
 	return Q_(T_wb, 'degC')
+
+
+# Weather files (EPW, TMY3)
+# region
+WEATHER_DTYPE = np.dtype([
+	('month', 'i1'), ('day', 'i1'), ('hour', 'i1'),
+	('T_db', 'f8'),			# dry-bulb temperature, degC
+	('T_dp', 'f8'),			# dew-point temperature, degC
+	('RH', 'f8'),			# relative humidity, %
+	('pressure', 'f8'),		# atmospheric station pressure, Pa
+	('GHI', 'f8'),			# global horizontal irradiance, W/m2
+	('DNI', 'f8'),			# direct (beam) normal irradiance, W/m2
+	('DHI', 'f8')])			# diffuse horizontal irradiance, W/m2
+
+class WeatherFile:
+	"""Hourly data of an EnergyPlus weather file (EPW) or a TMY3 CSV file as typed
+	NumPy columns, see `WEATHER_DTYPE`.
+
+	The first read of a file stores a binary copy next to it ('<file>.npy'); later
+	reads memory-map that copy instead of parsing the text again, as long as it
+	is newer than the weather file.
+
+	```
+	wf = WeatherFile.read('USA_GA_Atlanta.epw')
+	wf['T_db']							# array of 8760 dry-bulb temperatures
+	wd = wf.to_weather_data(months=[7])	# WeatherData of July
+	for month, data in WeatherFile.stream_months('USA_GA_Atlanta.epw'): ...
+	```
+	"""
+	# format: (header lines, column number of each field)
+	_epw_columns = {'year': 0, 'month': 1, 'day': 2, 'hour': 3, 'T_db': 6, 'T_dp': 7, 'RH': 8,
+					'pressure': 9, 'GHI': 13, 'DNI': 14, 'DHI': 15}
+	# missing-value codes of EPW (these values and above); TMY3 uses -9900
+	_missing = {'T_db': 99.9, 'T_dp': 99.9, 'RH': 999, 'pressure': 999999, 'GHI': 9999, 'DNI': 9999, 'DHI': 9999}
+	_tmy3_columns = {'date': 'Date (MM/DD/YYYY)', 'time': 'Time (HH:MM)', 'T_db': 'Dry-bulb (C)',
+					 'T_dp': 'Dew-point (C)', 'RH': 'RHum (%)', 'pressure': 'Pressure (mbar)',
+					 'GHI': 'GHI (W/m^2)', 'DNI': 'DNI (W/m^2)', 'DHI': 'DHI (W/m^2)'}
+
+	def __init__(self, ID: str, latitude: float, longitude: float, elevation: float, tz: float, data: np.ndarray) -> None:
+		"""
+		Parameters
+		----------
+		latitude, longitude:
+			Location in degrees, north and east positive.
+		elevation:
+			Elevation of the location in m.
+		tz:
+			Time zone, hours ahead or behind UTC.
+		data:
+			Structured array with dtype `WEATHER_DTYPE`, one row per hour.
+		"""
+		self.ID = ID
+		self.latitude = latitude
+		self.longitude = longitude
+		self.elevation = elevation
+		self.tz = tz
+		self.data = data
+
+	def __getitem__(self, column: str) -> np.ndarray:
+		return self.data[column]
+
+	def __len__(self) -> int:
+		return len(self.data)
+
+	@classmethod
+	def read(cls, filepath: str, cache: bool = True) -> WeatherFile:
+		"""Reads an EPW ('.epw') or TMY3 ('.csv') weather file. With `cache` the
+		parsed columns are kept in a binary copy that is memory-mapped next time."""
+		ID, latitude, longitude, elevation, tz = cls._read_location(filepath)
+		cache_path = filepath + '.npy'
+		if cache and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(filepath):
+			return cls(ID, latitude, longitude, elevation, tz, np.load(cache_path, mmap_mode='r'))
+		data = np.concatenate([chunk for _, chunk in cls.stream_months(filepath)])
+		if cache:
+			# written under a temporary name and renamed, so that a concurrent or
+			# interrupted run never leaves a truncated copy to be memory-mapped
+			temp = f'{cache_path}.{os.getpid()}.tmp'
+			try:
+				with open(temp, 'wb') as f:
+					np.save(f, data)
+				os.replace(temp, cache_path)
+			except PermissionError:
+				if os.path.exists(temp):
+					os.remove(temp)
+		return cls(ID, latitude, longitude, elevation, tz, data)
+
+	@classmethod
+	def stream_months(cls, filepath: str, chunksize: int = 744) -> Iterator[tuple[int, np.ndarray]]:
+		"""Parses a weather file in chunks of `chunksize` rows and yields the data
+		of one month at a time as (month, structured array)."""
+		is_epw = filepath.lower().endswith('.epw')
+		if is_epw:
+			columns = cls._epw_columns
+			reader = pd.read_csv(filepath, skiprows=8, header=None, usecols=list(columns.values()), chunksize=chunksize)
+		else:
+			columns = cls._tmy3_columns
+			reader = pd.read_csv(filepath, skiprows=1, usecols=list(columns.values()), chunksize=chunksize)
+		pending = np.empty(0, dtype=WEATHER_DTYPE)
+		with reader:
+			for chunk in reader:
+				rows = cls._epw_rows(chunk) if is_epw else cls._tmy3_rows(chunk)
+				rows = np.concatenate([pending, rows])
+				# a month is complete when rows of the next month have arrived
+				last = rows['month'][-1]
+				complete = rows['month'] != last
+				for month in dict.fromkeys(rows['month'][complete]):
+					yield int(month), rows[rows['month'] == month]
+				pending = rows[~complete]
+		if pending.size:
+			yield int(pending['month'][0]), pending
+
+	@classmethod
+	def _epw_rows(cls, chunk: pd.DataFrame) -> np.ndarray:
+		rows = np.empty(len(chunk), dtype=WEATHER_DTYPE)
+		for name, col in cls._epw_columns.items():
+			if name == 'year':
+				continue
+			rows[name] = chunk[col].to_numpy()
+		rows['hour'] -= 1		# hour 1 is the hour ending at 01:00
+		return rows
+
+	@classmethod
+	def _tmy3_rows(cls, chunk: pd.DataFrame) -> np.ndarray:
+		c = cls._tmy3_columns
+		rows = np.empty(len(chunk), dtype=WEATHER_DTYPE)
+		date = chunk[c['date']].str.split('/', expand=True).astype(int)
+		rows['month'] = date[0].to_numpy()
+		rows['day'] = date[1].to_numpy()
+		rows['hour'] = chunk[c['time']].str.split(':').str[0].astype(int).to_numpy() - 1
+		for name in ('T_db', 'T_dp', 'RH', 'GHI', 'DNI', 'DHI'):
+			rows[name] = chunk[c[name]].to_numpy()
+		rows['pressure'] = chunk[c['pressure']].to_numpy() * 100
+		return rows
+
+	@classmethod
+	def _read_location(cls, filepath: str) -> tuple:
+		"""(ID, latitude, longitude, elevation, tz) from the first line of the file."""
+		with open(filepath, encoding='latin-1') as f:
+			fields = [s.strip() for s in f.readline().split(',')]
+		if filepath.lower().endswith('.epw'):
+			# LOCATION,City,State,Country,Source,WMO,Latitude,Longitude,TimeZone,Elevation
+			return fields[1], float(fields[6]), float(fields[7]), float(fields[9]), float(fields[8])
+		# USAF,Name,State,TimeZone,Latitude,Longitude,Elevation
+		return fields[1], float(fields[4]), float(fields[5]), float(fields[6]), float(fields[3])
+
+	def missing(self, column: str, data: np.ndarray | None = None) -> np.ndarray:
+		"""Mask of the hours of `column` with a missing-value code."""
+		values = (self.data if data is None else data)[column]
+		return (values >= self._missing[column]) | (values <= -9900)
+
+	def filled(self, column: str, data: np.ndarray | None = None) -> np.ndarray:
+		"""Values of `column` with the missing values linearly interpolated
+		between the neighbouring valid hours (the nearest valid value at the
+		ends). Raises ValueError if no hour has a valid value."""
+		data = self.data if data is None else data
+		values = np.array(data[column], dtype=float)
+		missing = self.missing(column, data)
+		if missing.all():
+			raise ValueError(f'weather file {self.ID!r} has no valid {column} values')
+		if missing.any():
+			hours = np.arange(values.size)
+			values[missing] = np.interp(hours[missing], hours[~missing], values[~missing])
+		return values
+
+	def to_weather_data(self, months: Iterable[int] | None = None,
+						year: int = 2023,
+						timezone: str = 'Asia/Bangkok',
+						climate_type: str = ClimateType.TROPICAL) -> WeatherData:
+		"""Returns the hourly `WeatherData` (see `WeatherData.create_from_hourly_data`)
+		of the given consecutive `months` (all if None), with the measured beam
+		and diffuse irradiance and the wet-bulb temperature from dry-bulb
+		temperature, relative humidity and pressure. The data of hour h of the
+		file (h-1:00 to h:00) is assigned to local standard time h-1. Missing
+		values (see `missing`) are interpolated between the neighbouring hours;
+		without any valid pressure the standard sea-level pressure is used."""
+		data = self.data
+		if months is not None:
+			data = data[np.isin(data['month'], list(months))]
+		T_db, RH, DNI, DHI = (self.filled(name, data) for name in ('T_db', 'RH', 'DNI', 'DHI'))
+		try:
+			pressure = self.filled('pressure', data)
+		except ValueError:
+			pressure = np.full(len(data), 101325.0)
+		T_wb = HAPropsSI('Twb', 'T', T_db + 273.15, 'P', pressure, 'R', np.clip(RH, 0, 100) / 100) - 273.15
+		return WeatherData.create_from_hourly_data(self.ID,
+												   fi=Q_(self.latitude, 'deg'),
+												   L_loc=Q_(self.longitude, 'deg'),
+												   altitude=Q_(self.elevation, 'm'),
+												   T_db=Q_(T_db, 'degC'),
+												   T_wb=Q_(T_wb, 'degC'),
+												   start=Date(year, int(data['month'][0]), int(data['day'][0])),
+												   Eb=DNI,
+												   Ed=DHI,
+												   tz=self.tz,
+												   timezone=timezone,
+												   climate_type=climate_type)
+# endregion
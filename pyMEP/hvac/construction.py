@@ -0,0 +1,311 @@
+from __future__ import annotations
+from typing import Iterable
+import numpy as np
+from .. import Quantity
+
+Q_ = Quantity
+
+# ASHRAE Fundamentals 2021, Chapter 18, §18.21 surface resistances used for the
+# conduction time series: outside (h = 22.7 W/m²K) and inside (h = 8.29 W/m²K)
+R_OUTSIDE = Q_(0.044, 'm ** 2 * K / W')
+R_INSIDE = Q_(0.121, 'm ** 2 * K / W')
+
+PERIOD = 24 * 3600			# s, the design day
+HARMONICS = 24 * 200		# harmonics of the periodic solution
+
+class Layer:
+	"""One homogeneous layer of a wall or roof construction. A layer without
+	heat capacity (e.g. an air space) is given by its thermal resistance."""
+
+	def __init__(self):
+		self.name: str = ''
+		self.thickness: Quantity = Q_(0, 'm')
+		self.k: Quantity | None = None
+		self.rho: Quantity = Q_(0, 'kg / m ** 3')
+		self.cp: Quantity = Q_(0, 'J / (kg * K)')
+		self.R: Quantity
+
+	@classmethod
+	def create(cls, name: str,
+			   thickness: Quantity,
+			   k: Quantity,
+			   rho: Quantity,
+			   cp: Quantity) -> Layer:
+		"""Creates a `Layer` object (see ASHRAE Fundamentals 2021, Chapter 26,
+		Table 1 for material properties).
+
+		Parameters
+		----------
+		name:
+			Material of the layer.
+		thickness:
+			Thickness of the layer.
+		k:
+			Thermal conductivity.
+		rho:
+			Density.
+		cp:
+			Specific heat capacity.
+		"""
+		layer = cls()
+		layer.name = name
+		layer.thickness = thickness.to('m')
+		layer.k = k.to('W / (m * K)')
+		layer.rho = rho.to('kg / m ** 3')
+		layer.cp = cp.to('J / (kg * K)')
+		layer.R = (layer.thickness / layer.k).to('m ** 2 * K / W')
+		return layer
+
+	@classmethod
+	def create_resistance(cls, name: str, R: Quantity) -> Layer:
+		"""Creates a massless `Layer` with thermal resistance `R` (e.g. an air
+		space, see ASHRAE Fundamentals 2021, Chapter 26, Table 3)."""
+		layer = cls()
+		layer.name = name
+		layer.R = R.to('m ** 2 * K / W')
+		return layer
+
+	@property
+	def massless(self) -> bool:
+		return self.k is None or self.rho.m * self.cp.m == 0
+
+	def key(self) -> tuple:
+		"""Thermal properties in SI units that the conduction response depends on."""
+		if self.massless:
+			return (round(self.R.m, 9),)
+		return (round(self.thickness.m, 9), round(self.k.m, 9), round(self.rho.m, 9), round(self.cp.m, 9))
+
+	def __repr__(self) -> str:
+		return f'Layer({self.name!r}, R={self.R.m:.3f} m²K/W)'
+
+class Construction:
+	"""A wall or roof construction as a sequence of layers from outside to
+	inside. The conduction time series (CTS) follows from the periodic response
+	of one-dimensional transient conduction through the layers between the
+	sol-air temperature and the room air temperature (ASHRAE Fundamentals 2021,
+	Chapter 18, §18.21); identical constructions share one solution.
+
+	```
+	wall = Construction('Brick cavity wall', [
+		Layer.create('Brick', Q_(100, 'mm'), Q_(0.89, 'W/(m*K)'), Q_(1920, 'kg/m**3'), Q_(790, 'J/(kg*K)')),
+		Layer.create('Insulation', Q_(50, 'mm'), Q_(0.035, 'W/(m*K)'), Q_(30, 'kg/m**3'), Q_(1210, 'J/(kg*K)')),
+		Layer.create('Concrete block', Q_(150, 'mm'), Q_(0.5, 'W/(m*K)'), Q_(800, 'kg/m**3'), Q_(920, 'J/(kg*K)'))])
+	wall.CTS		# 24 values in percent
+	```
+	"""
+
+	def __init__(self, ID: str, layers: Iterable[Layer],
+				 R_outside: Quantity = R_OUTSIDE,
+				 R_inside: Quantity = R_INSIDE):
+		self.ID = ID
+		self.layers = list(layers)
+		self.R_outside = R_outside.to('m ** 2 * K / W')
+		self.R_inside = R_inside.to('m ** 2 * K / W')
+
+	def key(self) -> tuple:
+		"""Hashable description of the construction; equal keys have equal CTS."""
+		return (round(self.R_outside.m, 9), round(self.R_inside.m, 9), tuple(layer.key() for layer in self.layers))
+
+	@property
+	def R(self) -> Quantity:
+		"""Total thermal resistance including the surface resistances."""
+		return Q_(self.R_outside.m + self.R_inside.m + sum(layer.R.m for layer in self.layers), 'm ** 2 * K / W')
+
+	@property
+	def U(self) -> Quantity:
+		return (1 / self.R).to('W / (m ** 2 * K)')
+
+	@property
+	def CTS(self) -> np.ndarray:
+		"""Conduction time series in percent (24 values, read-only)."""
+		return conduction_time_series(self)
+
+	def __repr__(self) -> str:
+		return f'Construction({self.ID!r}, {len(self.layers)} layers, U={self.U.m:.3f} W/m²K)'
+
+_cts_cache: dict[tuple, np.ndarray] = {}
+
+def conduction_time_series(construction: Construction) -> np.ndarray:
+	"""Returns the CTS of `construction` in percent. Each unique construction
+	(see `Construction.key`) is solved once; later calls return the cached,
+	read-only array."""
+	key = construction.key()
+	cts = _cts_cache.get(key)
+	if cts is None:
+		cts = _solve_cts(key)
+		cts.flags.writeable = False
+		_cts_cache[key] = cts
+	return cts
+
+def _solve_cts(key: tuple) -> np.ndarray:
+	"""Periodic response factors of a construction given by its `key`.
+
+	The layers are chained as transmission matrices of the exact harmonic
+	solution of 1-D conduction for all harmonics of the day at once. The
+	inside heat flux, with the room at 0, due to a triangular unit pulse of the
+	outside temperature at hour 0 is summed over the harmonics and sampled at
+	every hour. Divided by U these response factors are the CTS.
+	"""
+	R_outside, R_inside, layers = key
+	n = np.arange(1, HARMONICS + 1)
+	omega = 2 * np.pi * n / PERIOD
+	# M = [[A, B], [C, D]] per harmonic, [T_out, q_out] = M @ [T_in, q_in]
+	M = np.broadcast_to(np.eye(2, dtype=complex), (n.size, 2, 2)).copy()
+	M[:, 0, 1] = R_outside
+	R_total = R_outside + R_inside
+	with np.errstate(over='ignore', invalid='ignore'):
+		for layer in layers:
+			if len(layer) == 1:
+				R = layer[0]
+				L = np.broadcast_to(np.array([[1, R], [0, 1]], dtype=complex), M.shape)
+			else:
+				thickness, k, rho, cp = layer
+				R = thickness / k
+				lam = np.sqrt(1j * omega * rho * cp / k)
+				x = lam * thickness
+				L = np.empty_like(M)
+				L[:, 0, 0] = L[:, 1, 1] = np.cosh(x)
+				L[:, 0, 1] = np.sinh(x) / (k * lam)
+				L[:, 1, 0] = k * lam * np.sinh(x)
+			M = M @ L
+			R_total += R
+		B = M[:, 0, 1] + M[:, 0, 0] * R_inside
+		Y = np.where(np.isfinite(B) & (B != 0), 1 / B, 0)
+	# Fourier coefficients of the triangular pulse (1 at hour 0, 0 at hours ±1)
+	c = (3600 / PERIOD) * np.sinc(n * 3600 / PERIOD) ** 2
+	hours = np.arange(24) * 3600
+	Y_0 = 1 / R_total
+	q = (3600 / PERIOD) * Y_0 + 2 * np.real(np.exp(1j * np.outer(hours, omega)) @ (c * Y))
+	q = np.clip(q, 0, None)
+	return 100 * q / q.sum()
+
+# ASHRAE Fundamentals 2021, Chapter 18, §18.21: split of the inside surface
+# coefficient (8.29 W/m²K) into convection to the room air and long-wave
+# radiation between the surfaces
+H_CONVECTIVE = 3.07			# W/m²K
+H_RADIATIVE = 5.22			# W/m²K
+
+class Surface:
+	"""A room surface for `room_time_series`: a construction with its area.
+	An exterior surface loses heat to the outside; the far side of an interior
+	surface (partition, floor or ceiling to an identical zone, furniture) is
+	adiabatic. Solar radiation entering the room is absorbed by the floor."""
+
+	def __init__(self, construction: Construction, area: Quantity, exterior: bool = True, floor: bool = False):
+		self.construction = construction
+		self.area = area.to('m ** 2')
+		self.exterior = exterior
+		self.floor = floor
+
+	@classmethod
+	def glazing(cls, U: Quantity, area: Quantity) -> Surface:
+		"""A massless exterior surface with U-value `U` (e.g. a window)."""
+		R = max(0.0, 1 / U.to('W / (m ** 2 * K)').m - R_OUTSIDE.m - R_INSIDE.m)
+		construction = Construction('Glazing', [Layer.create_resistance('Glazing', Q_(R, 'm ** 2 * K / W'))])
+		return cls(construction, area, exterior=True)
+
+	def key(self) -> tuple:
+		return (self.construction.key(), round(self.area.m, 6), self.exterior, self.floor)
+
+_room_cache: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}
+
+def room_time_series(surfaces: Iterable[Surface], steps_per_hour: int = 4) -> tuple[np.ndarray, np.ndarray]:
+	"""Returns the nonsolar and solar radiant time series (NS-RTS, S-RTS) in
+	percent of a room with the given surfaces, as read-only arrays.
+
+	A unit radiant pulse during the first hour is released on the inside
+	surfaces (nonsolar: in proportion to their area, solar: on the floor) with
+	the room air held at a constant temperature. The cooling load of every hour
+	is the heat convected from the surfaces to the room air, normalized to
+	100 % like the tabulated RTS (ASHRAE Fundamentals 2021, Chapter 18, §18.20).
+	Rooms with the same surfaces share one solution.
+	"""
+	surfaces = list(surfaces)
+	if not surfaces:
+		raise ValueError('a room needs at least one surface')
+	key = (steps_per_hour, tuple(s.key() for s in surfaces))
+	rts = _room_cache.get(key)
+	if rts is None:
+		rts = _solve_room(surfaces, steps_per_hour)
+		for a in rts:
+			a.flags.writeable = False
+		_room_cache[key] = rts
+	return rts
+
+def _surface_network(construction: Construction, exterior: bool, max_dx: float = 0.02) -> tuple[list[float], list[float], float | None]:
+	"""Finite volume cells of a construction from the inside surface outwards:
+	the capacitances (J/m²K, the inside surface node has none), the resistances
+	between consecutive nodes (m²K/W) and the resistance from the last node to
+	the outside (None if adiabatic)."""
+	C = [0.0]
+	R = []
+	pending = 0.0				# resistance since the last node
+	for layer in reversed(construction.layers):
+		if layer.massless:
+			pending += layer.R.m
+			continue
+		thickness, k, rho, cp = layer.thickness.m, layer.k.m, layer.rho.m, layer.cp.m
+		cells = max(2, int(np.ceil(thickness / max_dx)))
+		dx = thickness / cells
+		for _ in range(cells):
+			R.append(pending + dx / (2 * k))
+			C.append(rho * cp * dx)
+			pending = dx / (2 * k)
+	return C, R, (pending + construction.R_outside.m) if exterior else None
+
+def _solve_room(surfaces: list[Surface], steps_per_hour: int) -> tuple[np.ndarray, np.ndarray]:
+	"""Periodic response of the room to the radiant pulses: the finite volume
+	networks of all surfaces, coupled by convection to the room air and by
+	long-wave radiation through a star node, are stepped implicitly over all
+	timesteps of the day at once as one sparse block-cyclic linear system."""
+	from scipy.sparse import coo_matrix, diags, identity, kron
+	from scipy.sparse.linalg import splu
+
+	rows, cols, vals = [], [], []
+
+	def conductance(i: int, j: int | None, G: float) -> None:
+		# between nodes i and j, or from node i to a node held at 0 if j is None
+		rows.append(i); cols.append(i); vals.append(G)
+		if j is not None:
+			rows.extend((j, i, j)); cols.extend((j, j, i)); vals.extend((G, -G, -G))
+
+	capacitance = []
+	inside = []
+	for s in surfaces:
+		a = s.area.m
+		C, R, R_out = _surface_network(s.construction, s.exterior)
+		first = len(capacitance)
+		inside.append(first)
+		capacitance.extend(c * a for c in C)
+		for k, R_k in enumerate(R):
+			conductance(first + k, first + k + 1, a / R_k)
+		if R_out is not None:
+			conductance(first + len(C) - 1, None, a / R_out)
+	star = len(capacitance)
+	capacitance.append(0.0)
+	A = np.array([s.area.m for s in surfaces])
+	for i, a in zip(inside, A):
+		conductance(i, None, H_CONVECTIVE * a)
+		conductance(i, star, H_RADIATIVE * a)
+	n = len(capacitance)
+	K = coo_matrix((vals, (rows, cols)), shape=(n, n)).tocsr()
+
+	# x_k = node temperatures at timestep k: (C/dt + K) x_k - C/dt x_(k-1) = f u_k
+	steps = 24 * steps_per_hour
+	C_dt = diags(np.array(capacitance) / (3600 / steps_per_hour))
+	shift = coo_matrix((np.ones(steps), (np.arange(steps), np.arange(-1, steps - 1) % steps)), shape=(steps, steps))
+	system = (kron(identity(steps), C_dt + K) - kron(shift, C_dt)).tocsc()
+
+	floor = np.array([s.floor for s in surfaces])
+	solar = A * floor if floor.any() else A
+	f = np.zeros((n, 2))
+	f[inside, 0] = A / A.sum()
+	f[inside, 1] = solar / solar.sum()
+	u = np.zeros(steps)
+	u[:steps_per_hour] = 1.0
+	x = splu(system).solve(np.kron(u[:, None], f)).reshape(steps, n, 2)
+
+	load = np.einsum('kin,i->kn', x[:, inside, :], H_CONVECTIVE * A)
+	hourly = load.reshape(24, steps_per_hour, 2).mean(axis=1).clip(0, None)
+	rts = 100 * hourly / hourly.sum(axis=0)
+	return rts[:, 0].copy(), rts[:, 1].copy()
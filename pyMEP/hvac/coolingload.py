@@ -1,4 +1,9 @@
+from __future__ import annotations
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import ClassVar, Iterable
 import numpy as np
 import pandas as pd
 from .. import Quantity
@@ -44,6 +49,24 @@ class Setting:
 
 	tsm_export = False
 
+	def __init__(self, **values) -> None:
+		"""Settings of one model (zone, building element). The class attributes are
+		the global defaults; an instance only holds the values that differ, e.g.
+		`Setting(Inside_DB=Q_(23, 'degC'))`, and reads all others from the class.
+		"""
+		for k, v in values.items():
+			if k not in setting_values():
+				raise AttributeError(f'unknown setting {k}')
+			setattr(self, k, v)
+
+	def replace(self, **values) -> Setting:
+		"""Returns a copy of these settings with `values` changed."""
+		return Setting(**{**vars(self), **values})
+
+def setting_values(settings: Setting | type[Setting] = Setting) -> dict:
+	"""All setting values of `settings` (a `Setting` object or the class itself)."""
+	return {k: getattr(settings, k) for k, v in vars(Setting).items() if not k.startswith('_') and not callable(v)}
+
 @dataclass
 class RTS:
 	# ASHRAE Fundamentals 2021, Chapter 18, §18.38
@@ -107,6 +130,88 @@ class RTS:
 	Carpet = ('With Carpet', 'No Carpet')
 	Glass = ('10%', '50%', '90%')
 
+	# (configuration x 24) read-only arrays of all RTS, built at first use, and
+	# the row of every (nrts, zone, construction, carpet, glass) configuration
+	_arrays: ClassVar[dict[bool, np.ndarray]] = {}
+	_rows: ClassVar[dict[tuple, int]] = {}
+
+	@classmethod
+	def _key(cls, nrts: bool, zones: str | None, room_construction: str, carpet: str, glass: str | None) -> tuple:
+		key = (nrts, zones if nrts else None, room_construction, carpet, glass)
+		if key in cls._rows:
+			return key
+		# standard tables: interior nonsolar RTS do not depend on the glass,
+		# an unknown glass percentage falls back on the first column
+		if nrts and zones == 'Interior':
+			return (nrts, zones, room_construction, carpet, None)
+		return (nrts, key[1], room_construction, carpet, glass if glass in cls.Glass else cls.Glass[0])
+
+	@classmethod
+	def _build(cls) -> None:
+		for nrts, df in ((True, cls.nonsolar_rts_df), (False, cls.solar_rts_df)):
+			zones = cls.Zones if nrts else (None,)
+			for zone in zones:
+				isExterior = not(nrts) or zone == 'Exterior'
+				for room_construction in cls.Room_construction:
+					for carpet in cls.Carpet:
+						for glass in (cls.Glass if isExterior else (None,)):
+							index = 1 + (0 if zone is None else cls.Zones.index(zone) * 18)
+							index += cls.Room_construction.index(room_construction) * (6 if isExterior else 2)
+							index += cls.Carpet.index(carpet) * (3 if isExterior else 1)
+							index += cls.Glass.index(glass) if isExterior else 0
+							cls._rows[(nrts, zone, room_construction, carpet, glass)] = index - 1
+			array = df.iloc[:, 1:].to_numpy(dtype=float).T.copy()
+			array.flags.writeable = False
+			cls._arrays[nrts] = array
+
+	@classmethod
+	def rts_array(cls,
+				  nrts:bool = True,
+				  zones:str = 'Exterior',
+				  room_construction:str='Medium',
+				  carpet:str='No Carpet',
+				  glass:str = '50%') -> np.ndarray:
+		"""Returns the NS-RTS (`nrts`) or S-RTS of a zone configuration as a
+		read-only view of 24 values in percent. Registered RTS (see `register`)
+		are found the same way as the ASHRAE tables.
+		"""
+		if not cls._arrays:
+			cls._build()
+		key = cls._key(nrts, zones, room_construction, carpet, glass)
+		try:
+			return cls._arrays[nrts][cls._rows[key]]
+		except KeyError:
+			raise KeyError(f"no {'nonsolar' if nrts else 'solar'} RTS for {key[1:]}") from None
+
+	@classmethod
+	def register(cls,
+				 values: list | np.ndarray,
+				 nrts:bool = True,
+				 zones:str = 'Exterior',
+				 room_construction:str='Medium',
+				 carpet:str='No Carpet',
+				 glass:str = '50%') -> None:
+		"""Registers a project-specific RTS (24 values in percent) for a zone
+		configuration, e.g. from a heat balance calculation of the actual room.
+		The names need not be one of `Room_construction`, `Carpet` or `Glass`;
+		a registered configuration replaces the table value with the same names.
+		"""
+		values = np.asarray(values, dtype=float)
+		if values.shape != (24,):
+			raise ValueError(f'a RTS has 24 values, got {values.shape}')
+		if not cls._arrays:
+			cls._build()
+		key = (nrts, zones if nrts else None, room_construction, carpet, glass)
+		array = cls._arrays[nrts]
+		if key in cls._rows:
+			array = array.copy()
+			array[cls._rows[key]] = values
+		else:
+			cls._rows[key] = len(array)
+			array = np.vstack([array, values])
+		array.flags.writeable = False
+		cls._arrays[nrts] = array
+
 	@classmethod
 	def rts_values(cls,
 				   nrts:bool = True, 
@@ -114,44 +219,280 @@ class RTS:
 				   room_construction:str='Medium', 
 				   carpet:str='No Carpet', 
 				   glass:str = '50%') -> pd.DataFrame:
-		df = cls.nonsolar_rts_df if nrts else cls.solar_rts_df
-		isExterior = not(nrts) or cls.Zones.index(zones)==0
-		index = 1 + (0 if zones is None else cls.Zones.index(zones) * 18)
-		index += cls.Room_construction.index(room_construction) * (6 if isExterior else 2)
-		index += cls.Carpet.index(carpet) * (3 if isExterior else 1)
-		index += (cls.Glass.index(glass) if glass in cls.Glass else 0) if isExterior else 0
-		rts_df = df.iloc[:, index:(index+1)]
-		rts_df.columns = ['NS-RTS' if nrts else 'S-RTS']
-		return rts_df
-
-def TimeSeriesMethod(ts:list, heat_load:list, id:str = 'id', tstype:str = 'Tx') -> pd.Series:
+		values = cls.rts_array(nrts, zones, room_construction, carpet, glass)
+		if np.array_equal(values, np.round(values)):
+			values = values.astype(int)			# whole percentages, as in the tables
+		return pd.DataFrame({'NS-RTS' if nrts else 'S-RTS': values})
+
+def _rts_array(rts: pd.DataFrame | np.ndarray | list, column: str) -> np.ndarray:
+	"""Returns the values of a RTS as returned by `RTS.rts_values` or `RTS.rts_array`
+	(or a plain list) as an array."""
+	if isinstance(rts, pd.DataFrame):
+		return rts[column].to_numpy(dtype=float)
+	return np.asarray(rts, dtype=float)
+
+def _stack_rts(shared: pd.DataFrame | list | None, own: Iterable, column: str) -> np.ndarray:
+	"""The zone RTS if given, else the RTS of every element stacked row-wise. `own` is
+	only iterated when no zone RTS is given; an RTS object shared by several
+	elements is converted once."""
+	if shared is not None:
+		return _rts_array(shared, column)
+	arrays: dict[int, tuple] = {}
+	rows = []
+	for rts in own:
+		if id(rts) not in arrays:
+			arrays[id(rts)] = (rts, _rts_array(rts, column))
+		rows.append(arrays[id(rts)][1])
+	return np.vstack(rows)
+
+def circulant(ts: list | np.ndarray) -> np.ndarray:
+	"""Returns the periodic response matrix C of time series `ts` (in percent), with
+	C[j, i] = ts[(j - i) mod n] / 100, so that C @ q spreads each hourly heat input
+	q[i] over the following hours of the (periodic) design day."""
+	rts_array = np.asarray(ts, dtype=float) / 100
+	n = rts_array.size
+	hours = np.arange(n)
+	return rts_array[(hours[:, None] - hours[None, :]) % n]
+
+def stacked_time_series(ts: list | np.ndarray, heat_loads: np.ndarray) -> np.ndarray:
+	"""Applies the time series method to several heat input profiles at once.
+
+	Parameters
+	----------
+	ts:
+		One time series (n,) shared by all profiles, or one time series per
+		profile (m, n), in percent.
+	heat_loads:
+		Heat input profiles (m, n), one row per element.
+
+	Returns
+	-------
+	Cooling load or heat gain profiles (m, n).
+	"""
+	heat_loads = np.atleast_2d(np.asarray(heat_loads, dtype=float))
+	ts = np.asarray(ts, dtype=float)
+	if ts.ndim == 1:
+		return heat_loads @ circulant(ts).T
+	unique, inverse = np.unique(ts, axis=0, return_inverse=True)
+	if len(unique) < len(ts):
+		# rows that share a time series (e.g. the RTS of a zone) share one circulant product
+		result = np.empty_like(heat_loads)
+		for k, row in enumerate(unique):
+			rows = inverse.reshape(-1) == k
+			result[rows] = heat_loads[rows] @ circulant(row).T
+		return result
+	n = ts.shape[-1]
+	hours = np.arange(n)
+	C = ts[:, (hours[:, None] - hours[None, :]) % n] / 100
+	return np.einsum('mji,mi->mj', C, heat_loads)
+
+def design_day_time_series(ts: list | np.ndarray, heat_loads: np.ndarray) -> np.ndarray:
+	"""Applies the time series method to heat input profiles made of several
+	periodic design days back to back (m, d × n), e.g. the 12 monthly design
+	days; every day is treated on its own like in `stacked_time_series`.
+	"""
+	heat_loads = np.atleast_2d(np.asarray(heat_loads, dtype=float))
+	ts = np.asarray(ts, dtype=float)
+	m, N = heat_loads.shape
+	n = ts.shape[-1]
+	days = heat_loads.reshape(m * (N // n), n)
+	if ts.ndim == 2:
+		ts = np.repeat(ts, N // n, axis=0)
+	return stacked_time_series(ts, days).reshape(m, N)
+
+def annual_time_series(ts: list | np.ndarray, heat_loads: np.ndarray) -> np.ndarray:
+	"""Applies the time series method to heat input profiles of any length N >= n
+	(e.g. 8760 hours), as a non-periodic convolution: the heat input of hour t
+	spreads over hours t..t+n-1 only. The hours before the first one are taken as
+	a repeat of the first n hours (warm-up), so a profile made of identical days
+	gives the same result as `stacked_time_series` of one day.
+
+	Parameters
+	----------
+	ts:
+		One time series (n,) shared by all profiles, or one time series per
+		profile (m, n), in percent.
+	heat_loads:
+		Heat input profiles (m, N), one row per element.
+
+	Returns
+	-------
+	Cooling load or heat gain profiles (m, N).
+	"""
+	heat_loads = np.atleast_2d(np.asarray(heat_loads, dtype=float))
+	ts = np.asarray(ts, dtype=float) / 100
+	n = ts.shape[-1]
+	N = heat_loads.shape[1]
+	if N < n:
+		raise ValueError(f'at least {n} hours of heat input are required, got {N}')
+	padded = np.concatenate([heat_loads[:, 1:n], heat_loads], axis=1)
+	ts = np.broadcast_to(np.atleast_2d(ts), (heat_loads.shape[0], n))
+	result = np.zeros_like(heat_loads)
+	for k in range(n):
+		result += ts[:, k:k+1] * padded[:, n-1-k:n-1-k+N]
+	return result
+
+def _time_series_method(weather_data):
+	"""The time series function for the weather data: one periodic design day,
+	several design days back to back, or hourly weather."""
+	if weather_data.T_db_array.size == 24:
+		return stacked_time_series
+	if weather_data.design_days:
+		return design_day_time_series
+	return annual_time_series
+
+def TimeSeriesMethod(ts:list, heat_load:list, id:str = 'id', tstype:str = 'Tx', export:bool|TSMReport|None = None) -> pd.Series:
 	"""Load ที่เกิดขึ้นในแต่ละชั่วโมงจะถูกนำไปคูณกับ ts เพื่อกระจายเป็น load ในชั่วโมงถัดๆไป เช่น Load ที่เกิดขึ้นตอน 7 โมงเช้ามีค่า 260 Watt
 	ถ้า ts ที่เลือกใช้เป็น [49, 17, 9, 5, 3, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0 ,0, 0]
 	เมื่อนำไปคูณกับ ts จะได้ [127.4, 44.2, 23.4, 13, 7.8, 5.2, 5.2, 2.6, 2.6, 2.6, 2.6, 2.6, 2.6, 2.6, 2.6, 2.6, 2.6, 2.6, 2.6, 2.6, 0, 0, 0, 0]
 	ซึ่งจะกลายเป็น Load ที่ตกค้างไปมีผลในชั่วโมงถัดไป นั้้นคือจะมี Load 127.4W ตอน 7:00AM และตอน 8:00AM จะมีโหลดตกค้างอยู่อีก 44.2W 23.4W ในตอน 9:0AM 
-	ไล่ไปในชั่วโมงถัดไปตามลำดีบ ในบางครั้งถ้า Load ที่เกิดขึ้นเป็นตอนสามทุ่ม ภาระความร้อนก็จะมีผลไปจนถึงห้าโมงเย็นของวันถัดไป"""
-	def __FillDown(ilist, row, column):
-		for i in range(24):
-			df.iat[row+i, column] = ilist[i]
-
-	rts_array = np.array(ts)/100
-	df = pd.DataFrame(np.nan, index=range(48), columns=range(24))
-	for i in range(24):
-		cooling_load_array = rts_array * heat_load[i]
-		__FillDown(cooling_load_array, i, i)
-	sum_list = []
-	for i in range(48):
-		sum_list.append(df.iloc[i].sum(axis=0))
-	sum_df = pd.DataFrame(sum_list, columns=['S1'])
-	df = pd.concat([df, sum_df], axis=1)
-	half_sum_df = pd.DataFrame(sum_list[24:], columns=['S2'])
-	df = pd.concat([df, half_sum_df], axis=1)
-	dfx = df['S1'][0:24] + df['S2'][0:24]
-	df.insert(loc=26, column='Q_o', value=dfx)
-	df.insert(loc=0, column='Q_i', value=heat_load+([np.nan] * 24))
-	df.insert(loc=0, column=tstype, value=ts+([np.nan] * 24))
-	if Setting.tsm_export: 
+	ไล่ไปในชั่วโมงถัดไปตามลำดีบ ในบางครั้งถ้า Load ที่เกิดขึ้นเป็นตอนสามทุ่ม ภาระความร้อนก็จะมีผลไปจนถึงห้าโมงเย็นของวันถัดไป
+	
+	The spreading is a circular convolution of `heat_load` with `ts`, evaluated as one
+	circulant matrix product. The 48-row diagnostic table is only built when
+	`export` is on (default `Setting.tsm_export`): with a `TSMReport` the inputs
+	are handed to the report, which builds and writes the tables later; with
+	True the table is written to '<id>.<tstype>_tsm.xlsx' right away."""
+	heat_load = np.asarray(heat_load, dtype=float)
+	dfx = pd.Series(circulant(ts) @ heat_load)
+	export = Setting.tsm_export if export is None else export
+	if isinstance(export, TSMReport):
+		export.add(id, tstype, ts, heat_load, dfx.to_numpy())
+	elif export: 
+		df = _tsm_dataframe(ts, heat_load, dfx, tstype)
 		try:
 			df.to_excel(id+'.'+tstype+'_tsm.xlsx')
 		except PermissionError: ...
 	return dfx
+
+def _tsm_dataframe(ts:list, heat_load:np.ndarray, dfx:pd.Series, tstype:str) -> pd.DataFrame:
+	"""Diagnostic table of the time series method: column i holds the heat input of
+	hour i spread over rows i..i+n-1, followed by the row sums S1, the wrapped sums S2
+	and the resulting cooling load Q_o."""
+	rts_array = np.asarray(ts, dtype=float) / 100
+	n = heat_load.size
+	hours = np.arange(n)
+	spread = np.full((2*n, n), np.nan)
+	spread[hours[:, None] + hours[None, :], hours[None, :]] = rts_array[:, None] * heat_load[None, :]
+	df = pd.DataFrame(spread, index=range(2*n), columns=range(n))
+	sum_list = np.nansum(spread, axis=1)
+	df['S1'] = sum_list
+	df['S2'] = pd.Series(sum_list[n:])
+	df.insert(loc=n+2, column='Q_o', value=dfx)
+	df.insert(loc=0, column='Q_i', value=list(heat_load)+([np.nan] * n))
+	df.insert(loc=0, column=tstype, value=list(ts)+([np.nan] * n))
+	return df
+
+class TSMReport:
+	"""Collects the diagnostic tables of `TimeSeriesMethod` in memory and writes
+	them in a background thread, instead of one Excel file per call:
+
+	- '.xlsx': one workbook with a sheet per element (ID), its tables (CTS,
+	  NS-RTS, S-RTS) side by side. The first write of a report replaces the
+	  file, later writes replace the sheets of the elements they hold. IDs
+	  cut to 31 characters that clash get a suffix '~2', '~3', ...;
+	- '.parquet': a directory with one Parquet file per element, the tables
+	  stacked with column 'TS' naming the time series (needs pyarrow or
+	  fastparquet).
+
+	```
+	report = TSMReport('tsm.xlsx')
+	settings = Setting(tsm_export=report)			# or Setting.tsm_export = report
+	for wall in walls:
+		wall.settings = settings
+		wall.update_cooling_load()
+	report.write().result()							# raises if writing failed
+	```
+	Only the inputs are stored by `add`; the tables are built while writing.
+	The report collects the calls of `TimeSeriesMethod`, i.e. the
+	`update_cooling_load` of single elements, windows and internal heat gains.
+	`Zone` and `Building` calculate their loads stacked without it and reject
+	settings with `tsm_export` on.
+	"""
+	def __init__(self, filepath: str = 'tsm_report.xlsx') -> None:
+		self.filepath = filepath
+		self.format = 'parquet' if filepath.lower().endswith('.parquet') else 'xlsx'
+		if self.format == 'parquet':
+			pd.io.parquet.get_engine('auto')		# ImportError if no Parquet engine is installed
+		self._items: list[tuple[str, str, np.ndarray, np.ndarray, np.ndarray]] = []
+		self._lock = threading.Lock()
+		self._executor: ThreadPoolExecutor | None = None
+		self._sheets: dict[str, str] = {}			# element ID -> sheet name, of the writes so far
+
+	def add(self, id: str, tstype: str, ts: list, heat_load: np.ndarray, cooling_load: np.ndarray) -> None:
+		with self._lock:
+			self._items.append((id, tstype, np.array(ts, dtype=float), np.array(heat_load, dtype=float), np.array(cooling_load, dtype=float)))
+
+	def __len__(self) -> int:
+		return len(self._items)
+
+	def tables(self) -> dict[str, dict[str, pd.DataFrame]]:
+		"""The diagnostic tables collected so far, per element ID and time series."""
+		with self._lock:
+			items = list(self._items)
+		return _tsm_tables(items)
+
+	def write(self) -> Future:
+		"""Writes the collected tables in a background thread and empties the
+		report. The returned future raises the error of the write, if any."""
+		with self._lock:
+			items, self._items = self._items, []
+			if self._executor is None:
+				self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tsm-report')
+		return self._executor.submit(self._write, items)
+
+	def close(self) -> None:
+		"""Writes what is left and waits until all writes are done."""
+		future = self.write()
+		self._executor.shutdown(wait=True)
+		self._executor = None
+		future.result()
+
+	def __enter__(self) -> TSMReport:
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self.close()
+
+	def _write(self, items: list) -> None:
+		if not items:
+			return
+		tables = _tsm_tables(items)
+		if self.format == 'parquet':
+			os.makedirs(self.filepath, exist_ok=True)
+			for id, element_tables in tables.items():
+				frames = []
+				for tstype, df in element_tables.items():
+					df = df.rename(columns={tstype: 'ts'})
+					df.columns = df.columns.astype(str)
+					df.insert(0, 'TS', tstype)
+					frames.append(df)
+				pd.concat(frames).to_parquet(os.path.join(self.filepath, f'{id}.parquet'))
+		else:
+			# a new workbook on the first write, later writes add or replace its sheets
+			mode = 'a' if self._sheets else 'w'
+			options = {'if_sheet_exists': 'replace'} if mode == 'a' else {}
+			with pd.ExcelWriter(self.filepath, mode=mode, **options) as writer:
+				for id, element_tables in tables.items():
+					col = 0
+					for df in element_tables.values():
+						df.to_excel(writer, sheet_name=self._sheet_name(id), startcol=col)
+						col += df.shape[1] + 2
+
+	def _sheet_name(self, id: str) -> str:
+		"""Sheet of element `id`: the ID cut to Excel's 31 characters, with a
+		suffix if another element already has that (case-insensitive) name."""
+		if id not in self._sheets:
+			taken = {name.lower() for name in self._sheets.values()}
+			name, n = id[:31], 1
+			while name.lower() in taken:
+				n += 1
+				name = id[:31 - len(f'~{n}')] + f'~{n}'
+			self._sheets[id] = name
+		return self._sheets[id]
+
+def _tsm_tables(items: list) -> dict[str, dict[str, pd.DataFrame]]:
+	tables: dict[str, dict[str, pd.DataFrame]] = {}
+	for id, tstype, ts, heat_load, cooling_load in items:
+		tables.setdefault(id, {})[tstype] = _tsm_dataframe(ts, heat_load, pd.Series(cooling_load), tstype)
+	return tables
@@ -1,10 +1,13 @@
 ﻿from __future__ import annotations
+import numpy as np
 import pandas as pd
 from abc import ABC, abstractmethod
 from typing import Callable
+from datetime import date as Date
 from enum import Enum
 from .. import Quantity
 from .coolingload import Setting
+from .time import schedule_vector
 
 Q_ = Quantity
 
@@ -57,6 +60,19 @@ class Equipment(ABC):
         """
         ...
 
+    @abstractmethod
+    def unit_heat_gain(self) -> tuple[float, float, float]:
+        """Returns the radiative sensible, the convective sensible and the
+        latent heat gain in Watts when the schedule value is 1. The heat gain at
+        any hour is this tuple multiplied by the schedule value at that hour.
+        """
+        ...
+
+    def schedule_vector(self, hours: int = 24, start: Date | None = None) -> np.ndarray:
+        """Returns the schedule value at every hour as an array of length
+        `hours`, from midnight of date `start` if the schedule is a `Schedule`."""
+        return schedule_vector(self.schedule, hours, start)
+
 class Machine(Equipment):
     """Represents any machine driven by an electric motor (e.g., a fan, a pump, etc.)."""
     class Configuration(Enum):
@@ -115,18 +131,26 @@ class Machine(Equipment):
         machine.F_rad = F_rad.to('%')
         return machine
 
-    def calculate_heat_gain(self, t_sol_sec: float) -> None:
+    def _Q_dot_sen_full(self) -> Quantity:
         if self.configuration == self.Configuration.ONLY_MACHINE:
-            self.Q_dot_sen = self.P_motor
+            return self.P_motor
         elif self.configuration == self.Configuration.ONLY_MOTOR:
-            self.Q_dot_sen = (1.0 - self.eta_motor) * (self.P_motor / self.eta_motor)
+            return (1.0 - self.eta_motor) * (self.P_motor / self.eta_motor)
         else:
-            self.Q_dot_sen = self.P_motor / self.eta_motor
+            return self.P_motor / self.eta_motor
+
+    def calculate_heat_gain(self, t_sol_sec: float) -> None:
+        self.Q_dot_sen = self._Q_dot_sen_full()
         div_fac = self.schedule(t_sol_sec)
         self.Q_dot_sen *= div_fac
         self.Q_dot_sen_rd = self.F_rad * self.Q_dot_sen
         self.Q_dot_sen_cv = self.Q_dot_sen - self.Q_dot_sen_rd
 
+    def unit_heat_gain(self) -> tuple[float, float, float]:
+        Q_dot_sen = self._Q_dot_sen_full().to('W').m
+        Q_dot_sen_rd = self.F_rad.to('').m * Q_dot_sen
+        return Q_dot_sen_rd, Q_dot_sen - Q_dot_sen_rd, 0.0
+
 class HoodedCookingAppliance(Equipment):
     """Represents a cooking appliance installed under an effective hood; only
     radiant gain adds to the cooling load of the space."""
@@ -176,6 +200,9 @@ class HoodedCookingAppliance(Equipment):
         self.Q_dot_sen_cv = Q_(0.0, 'W')
         self.Q_dot_sen_rd = div_fac * self.F_rad * self.F_U * self.P_rated
 
+    def unit_heat_gain(self) -> tuple[float, float, float]:
+        return (self.F_rad * self.F_U * self.P_rated).to('W').m, 0.0, 0.0
+
 class OfficeAppliance(Equipment):
     """Represents a single office appliance or a group of appliances in
     a room. The heat gain is calculated based on the technical specifications
@@ -235,6 +262,11 @@ class OfficeAppliance(Equipment):
         self.Q_dot_sen_rd = self.F_rad * self.Q_dot_sen
         self.Q_dot_sen_cv = self.Q_dot_sen - self.Q_dot_sen_rd
 
+    def unit_heat_gain(self) -> tuple[float, float, float]:
+        Q_dot_sen = self.P_peak.to('W').m
+        Q_dot_sen_rd = self.F_rad.to('').m * Q_dot_sen
+        return Q_dot_sen_rd, Q_dot_sen - Q_dot_sen_rd, 0.0
+
 class OfficeEquipment(Equipment):
     """This class can be used to estimate the heat gain of office equipment on a
     per-square-metre basis."""
@@ -284,6 +316,11 @@ class OfficeEquipment(Equipment):
         self.Q_dot_sen_rd = self.F_rad.to('').m * self.Q_dot_sen
         self.Q_dot_sen_cv = self.Q_dot_sen - self.Q_dot_sen_rd
 
+    def unit_heat_gain(self) -> tuple[float, float, float]:
+        Q_dot_sen = (self.heat_density * self.A_floor).to('W').m
+        Q_dot_sen_rd = self.F_rad.to('').m * Q_dot_sen
+        return Q_dot_sen_rd, Q_dot_sen - Q_dot_sen_rd, 0.0
+
 class GenericAppliance(Equipment):
     """Represents a generic appliance that doesn't belong to any of the
     other categories implemented above.
@@ -333,3 +370,8 @@ class GenericAppliance(Equipment):
         self.Q_dot_sen_rd = div_fac * self.F_rad.to('').m * self.Q_dot_sen_pcs
         self.Q_dot_sen_cv = self.Q_dot_sen - self.Q_dot_sen_rd
         self.Q_dot_lat = div_fac *  self.Q_dot_lat_pcs
+
+    def unit_heat_gain(self) -> tuple[float, float, float]:
+        Q_dot_sen = self.Q_dot_sen_pcs.to('W').m
+        Q_dot_sen_rd = self.F_rad.to('').m * Q_dot_sen
+        return Q_dot_sen_rd, Q_dot_sen - Q_dot_sen_rd, self.Q_dot_lat_pcs.to('W').m
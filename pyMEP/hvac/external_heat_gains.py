@@ -1,74 +1,183 @@
-﻿from abc import ABC, abstractmethod
+﻿from __future__ import annotations
+from abc import ABC, abstractmethod
+import weakref
+from typing import Iterable
 import pandas as pd
 import numpy as np
-from scipy.interpolate import interp1d
 from enum import Enum
 from .. import Quantity
 from .climatic import WeatherData
-from .coolingload import Setting, TimeSeriesMethod
+from .coolingload import Setting, TimeSeriesMethod, _rts_array, _stack_rts, _time_series_method
+from .construction import Construction
+from .geometry import profile_angle
 
 Q_ = Quantity
 
+# incidence angles of the SHGC table `Window.SHGCd`
+SHGC_ANGLES = np.array([0, 40, 50, 60, 70, 80, 90])
+
+def _magnitude(v):
+	return getattr(v, 'm', v)
+
+class ResultRecord:
+	"""Hourly results of a building element: named columns of equal length stored
+	as rows of one float array (column × hour). Columns are read as arrays with
+	`record['TOTAL_CL']`; the pandas DataFrame is only built when `to_dataframe`
+	is called and is kept for later calls.
+	"""
+	__slots__ = ('names', 'values', '_df')
+
+	def __init__(self, columns: dict) -> None:
+		"""`columns` maps the column names to arrays (or Quantity arrays, lists,
+		pandas Series) of the same length; scalars are broadcast."""
+		self.names = tuple(columns)
+		arrays = [np.asarray(_magnitude(v), dtype=float) for v in columns.values()]
+		n = max((a.size for a in arrays), default=0)
+		self.values = np.empty((len(arrays), n))
+		for i, a in enumerate(arrays):
+			self.values[i] = a
+		self._df = None
+
+	@classmethod
+	def from_dataframe(cls, df: pd.DataFrame) -> ResultRecord:
+		record = cls({c: df[c].to_numpy() for c in df.columns})
+		record._df = df
+		return record
+
+	def __getitem__(self, name: str) -> np.ndarray:
+		return self.values[self.names.index(name)]
+
+	def __contains__(self, name: str) -> bool:
+		return name in self.names
+
+	def __len__(self) -> int:
+		return self.values.shape[1]
+
+	def __repr__(self) -> str:
+		return repr(self.to_dataframe())
+
+	def to_dataframe(self) -> pd.DataFrame:
+		if self._df is None:
+			df = pd.DataFrame(self.values.T, columns=list(self.names), copy=False)
+			if 'LST' in self.names:
+				df['LST'] = df['LST'].astype(int)
+			self._df = df
+		return self._df
+
 class Building_Element(ABC):
 	weather_data: WeatherData
 	net_area: Quantity
 	U : Quantity
 	sigma : Quantity													# ASHRAE Fundamentals 2021 p14.11 tilt angle
 	NS_RTS : pd.DataFrame
-	solar_irradiance_df : pd.DataFrame | None = None	
-	cooling_load_df : pd.DataFrame | None = None	
+	solar_irradiance : ResultRecord | None = None
+	cooling_load : ResultRecord | None = None
+	settings : Setting | type[Setting] = Setting						# see `Setting`; a `Zone` assigns its own
+	construction : Construction | None = None							# layered construction, see `set_construction`
+	_F_rad_setting : str | None = None									# `Setting` with the radiative fraction of the element
 
 	def __init__(self, id: str) -> None:
 		self.ID = id
 		self.psi = Q_(0, 'deg')											# ASHRAE Fundamentals 2021 p14.11 surface azimuth		
-		self.surface_absorptance : float = Setting.surface_absorptance	# ASHRAE Fundamentals 2021 p18.25 Surface Absorptance
-		self.delta_T = Setting.delta_T
+		# None: the value of `settings`, read when the load is calculated
+		self._surface_absorptance : float | None = None
+		self._delta_T : Quantity | None = None
+		self._F_rad : float | None = None
 		self.CTS = [12,43,26,11,5,2,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]		
 	
 	@abstractmethod
-	def update_cooling_load(self) -> pd.DataFrame:
-		"""Update Cooling Load Component DataFrame as current component.
+	def update_cooling_load(self) -> ResultRecord:
+		"""Update Cooling Load Component record as current component.
 		"""
 		...
 
 	def Update_ns_rts(self, ns_rts: pd.DataFrame) -> None:
 		self.NS_RTS = ns_rts
 		self.update_cooling_load()
+
+	@property
+	def surface_absorptance(self) -> float:
+		"""ASHRAE Fundamentals 2021 p18.25 Surface Absorptance; `settings.surface_absorptance` unless set."""
+		return self.settings.surface_absorptance if self._surface_absorptance is None else self._surface_absorptance
+	@surface_absorptance.setter
+	def surface_absorptance(self, surface_absorptance: float | None) -> None:
+		self._surface_absorptance = surface_absorptance
+
+	@property
+	def delta_T(self) -> Quantity:
+		"""Temperature difference with the adjacent space; `settings.delta_T` unless set."""
+		return self.settings.delta_T if self._delta_T is None else self._delta_T
+	@delta_T.setter
+	def delta_T(self, delta_T: Quantity | None) -> None:
+		self._delta_T = delta_T
+
+	@property
+	def F_rad(self) -> float | None:
+		"""Radiative fraction of the conduction heat gain; `settings.Roof_F_rad` or
+		`settings.Wall_F_rad` unless set, None for other elements."""
+		if self._F_rad is None and self._F_rad_setting is not None:
+			return getattr(self.settings, self._F_rad_setting)
+		return self._F_rad
+	@F_rad.setter
+	def F_rad(self, F_rad: float | None) -> None:
+		self._F_rad = F_rad
+
+	def set_construction(self, construction: Construction, update_U: bool = True) -> None:
+		"""Takes the CTS of the element, and its U-value if `update_U`, from the
+		layered `construction`."""
+		self.construction = construction
+		self.CTS = construction.CTS.tolist()
+		if update_U:
+			self.U = construction.U
+
+	@property
+	def cooling_load_df(self) -> pd.DataFrame | None:
+		"""Cooling load components, built from `cooling_load` when first accessed."""
+		return None if self.cooling_load is None else self.cooling_load.to_dataframe()
+	@cooling_load_df.setter
+	def cooling_load_df(self, df: pd.DataFrame | None) -> None:
+		self.cooling_load = None if df is None else ResultRecord.from_dataframe(df)
+
+	@property
+	def solar_irradiance_df(self) -> pd.DataFrame | None:
+		"""Surface irradiance, built from `solar_irradiance` when first accessed."""
+		return None if self.solar_irradiance is None else self.solar_irradiance.to_dataframe()
+	@solar_irradiance_df.setter
+	def solar_irradiance_df(self, df: pd.DataFrame | None) -> None:
+		self.solar_irradiance = None if df is None else ResultRecord.from_dataframe(df)
 	
 class Roof(Building_Element):
+	_F_rad_setting = 'Roof_F_rad'
+
 	def __init__(self, id: str) -> None:
 		super().__init__(id=id)
-		self.F_rad = Setting.Roof_F_rad
 		self.sigma = Q_(0, 'deg')		
 
-	def update_cooling_load(self) -> pd.DataFrame:
+	def update_cooling_load(self) -> ResultRecord:
 		"""ASHRAE Fundamentals 2021 p14.11
 		Calculation of Clear-Sky Solar Irradiance Incident On Receiving Surface"""
-		self.solar_irradiance_df = _solar_irradiance(element=self)
+		self.solar_irradiance = _solar_irradiance(element=self)
 
 		"""ASHRAE Fundamentals 2021 p18.24
 		Heat Gain Through Exterior Surface"""
-		self.cooling_load_df = self.solar_irradiance_df[['LST','Et(W/m2)']].copy()
-		_external_cooling_load(element=self, long_wave_correction=Setting.hlwc)
-		return self.cooling_load_df
+		self.cooling_load = _external_cooling_load(element=self, long_wave_correction=self.settings.hlwc)
+		return self.cooling_load
 
 class Ceiling(Building_Element):
 	def __init__(self, id: str) -> None:
 		super().__init__(id=id)
 
-	def update_cooling_load(self) -> pd.DataFrame:
-		self.cooling_load_df = self.weather_data.position_df[['LST']].copy()
-		_internal_cooling_load(element=self)
-		return self.cooling_load_df
+	def update_cooling_load(self) -> ResultRecord:
+		self.cooling_load = _internal_cooling_load(element=self)
+		return self.cooling_load
 
 class Floor(Building_Element):
 	def __init__(self, id: str) -> None:
 		super().__init__(id=id)
 	
-	def update_cooling_load(self) -> pd.DataFrame:
-		self.cooling_load_df = self.weather_data.position_df[['LST']].copy()
-		_internal_cooling_load(element=self)
-		return self.cooling_load_df
+	def update_cooling_load(self) -> ResultRecord:
+		self.cooling_load = _internal_cooling_load(element=self)
+		return self.cooling_load
 
 class Wall(Building_Element):
 	
@@ -76,9 +185,10 @@ class Wall(Building_Element):
 		External = True
 		Internal = False	
 	
+	_F_rad_setting = 'Wall_F_rad'
+
 	def __init__(self, id: str) -> None:
 		super().__init__(id=id)
-		self.F_rad = Setting.Wall_F_rad
 		self.sigma = Q_(90, 'deg')
 		self.wall_type = self.WallType.External
 		self.windows: dict[str, Window] = {}
@@ -89,10 +199,10 @@ class Wall(Building_Element):
 							gross_area : Quantity,
 							U: Quantity,
 							NS_RTS: pd.DataFrame,
-							CTS: list,
+							CTS: list | Construction,
 							surface_azimuth: Quantity,							
 							tilt_angle: Quantity = Q_(90, 'deg'),							
-							surface_absorptance : float = Setting.surface_absorptance							
+							surface_absorptance : float | None = None							
 							) -> Building_Element:
 		obj = cls(id=id)
 		obj.weather_data = weather_data
@@ -100,7 +210,10 @@ class Wall(Building_Element):
 		obj.net_area = gross_area
 		obj.U = U
 		obj.NS_RTS = NS_RTS
-		obj.CTS = CTS
+		if isinstance(CTS, Construction):
+			obj.set_construction(CTS, update_U=False)
+		else:
+			obj.CTS = CTS
 		obj.psi = surface_azimuth
 		obj.sigma = tilt_angle.to('rad')
 		obj.surface_absorptance = surface_absorptance		
@@ -112,7 +225,7 @@ class Wall(Building_Element):
 							gross_area: Quantity,
 							U: Quantity,
 							NS_RTS: pd.DataFrame,
-							delta_T: Quantity = Setting.delta_T
+							delta_T: Quantity | None = None
 							) -> Building_Element:
 		obj = cls(id=id)
 		obj.weather_data = weather_data
@@ -135,24 +248,23 @@ class Wall(Building_Element):
 	def clear_window(self):
 		self.windows.clear()
 
-	def update_cooling_load(self) -> pd.DataFrame:
+	def update_cooling_load(self) -> ResultRecord:
 		if self.wall_type == self.WallType.External:
 			"""ASHRAE Fundamentals 2021 p14.11
 			Calculation of Clear-Sky Solar Irradiance Incident On Receiving Surface"""
-			self.solar_irradiance_df = _solar_irradiance(element=self)
+			self.solar_irradiance = _solar_irradiance(element=self)
 
 			"""ASHRAE Fundamentals 2021 p18.24
 			Heat Gain Through Exterior Surface"""
-			self.cooling_load_df = self.solar_irradiance_df[['LST','Et(W/m2)']].copy()
-			_external_cooling_load(element=self, long_wave_correction=Setting.vlwc)
+			self.cooling_load = _external_cooling_load(element=self, long_wave_correction=self.settings.vlwc)
 		else:
-			self.cooling_load_df = self.weather_data.position_df[['LST']].copy()
-			_internal_cooling_load(element=self)
-		return self.cooling_load_df
+			self.cooling_load = _internal_cooling_load(element=self)
+		return self.cooling_load
 
 class Window(Building_Element):
 
-	window_SHG_df : pd.DataFrame
+	window_SHG : ResultRecord | None = None
+	shading : Shading | None = None										# overhang and side fins, see `Shading`
 
 	def __init__(self, id: str):
 		super().__init__(id=id)
@@ -175,6 +287,7 @@ class Window(Building_Element):
 		obj = cls(id=id)
 		obj.host = host
 		obj.weather_data = host.weather_data
+		obj.settings = host.settings
 		obj.psi = host.psi
 		obj.Width = width
 		obj.Height = height
@@ -182,78 +295,80 @@ class Window(Building_Element):
 		obj.SC = SC
 		return obj
 
-	def update_cooling_load(self) -> pd.DataFrame:
-		df = self.host.solar_irradiance_df[['LST','Etb(W/m2)','Etd(W/m2)','Etr(W/m2)','Incidence']].copy()
-		Incidence = df['Incidence'].to_numpy()
+	@property
+	def window_SHG_df(self) -> pd.DataFrame | None:
+		"""Window heat gain components, built from `window_SHG` when first accessed."""
+		return None if self.window_SHG is None else self.window_SHG.to_dataframe()
+
+	def update_cooling_load(self) -> ResultRecord:
+		LST = self.host.weather_data.position_df['LST']
+		irradiance = irradiance_cache.get(self.host.weather_data, self.host.psi.m, self.host.sigma.m, self.settings.rho)
+		Incidence = irradiance['Incidence'].copy()
 		Incidence[Incidence > 90] = 0
-		x = np.array([0, 40, 50, 60, 70, 80, 90])
-		y = np.array(self.SHGCd)
-		fx = interp1d(x, y)
-		SHGC = fx(Incidence)
-		df['SHGC'] = SHGC
+		SHGC = np.interp(Incidence, SHGC_ANGLES, self.SHGCd)
 
-		# Direct Solar Heat Gain
-		Etb = df['Etb(W/m2)'].to_numpy()
-		qb = self.net_area*Etb*SHGC*self.SC
-		df['qbHG'] = qb
+		# Direct Solar Heat Gain, on the sunlit part of the window
+		Etb = irradiance['Etb(W/m2)']
+		if self.shading is not None:
+			sunlit = self.sunlit_fraction()
+			Etb = Etb * sunlit
+		qb = _magnitude(self.net_area*Etb*SHGC*self.SC)
 
 		# Diffuse Solar Heat Gain
-		Etd = df['Etd(W/m2)'].to_numpy()
-		Etr = df['Etr(W/m2)'].to_numpy()
-		qd = self.net_area*(Etd+Etr)*self.SHGCh
-		df['qdHG'] = qd
+		Etd = irradiance['Etd(W/m2)']
+		Etr = irradiance['Etr(W/m2)']
+		qd = _magnitude(self.net_area*(Etd+Etr)*self.SHGCh)
 
 		# Conduction Heat Gain
-		Tout = self.host.cooling_load_df['Out_T'].to_numpy()
-		df['Out_T'] = Tout
-		cdhg = self.U*self.net_area*(Tout - Setting.Inside_DB.m)
-		df['CondHG'] = cdhg
+		Tout = self.host.cooling_load['Out_T']
+		cdhg = _magnitude(self.U*self.net_area*(Tout - self.settings.Inside_DB.m))
 
 		# Total Window Heat Gain
 		TOTAL_HG = qb+qd+cdhg
-		df['TOTAL_HG'] = TOTAL_HG
-		self.window_SHG_df = df
-
-		df = self.window_SHG_df[['LST','qbHG']].copy()
+		columns = {'LST': LST, 'Etb(W/m2)': Etb, 'Etd(W/m2)': Etd, 'Etr(W/m2)': Etr,
+				   'Incidence': Incidence, 'SHGC': SHGC, 'qbHG': qb, 'qdHG': qd,
+				   'Out_T': Tout, 'CondHG': cdhg, 'TOTAL_HG': TOTAL_HG}
+		if self.shading is not None:
+			columns['Sunlit'] = sunlit
+		self.window_SHG = ResultRecord(columns)
 
 		# S-RTS
-		s_rts = self.S_RTS['S-RTS'].tolist()
-		df['S-RTS'] = s_rts
+		s_rts = _rts_array(self.S_RTS, 'S-RTS')
 
 		# Direct Solar Cooling Load
-		di_CL = TimeSeriesMethod(ts=s_rts, heat_load=qb.m.tolist(), id=self.ID, tstype='S-RTS')
-		df['di_CL'] = di_CL
+		di_CL = TimeSeriesMethod(ts=s_rts, heat_load=qb, id=self.ID, tstype='S-RTS', export=self.settings.tsm_export).to_numpy()
 
 		# Heat Gain
-		df[['qdHG','CondHG']] = self.window_SHG_df[['qdHG','CondHG']]
 		hg = qd+cdhg
-		df['Heat Gain'] = hg
 
 		# Convective Heat Gain
-		F_rad = SHGC
-		F_rad[F_rad > 0.5] = Setting.Window_hshgc_F_rad
-		F_rad[F_rad != Setting.Window_hshgc_F_rad] = Setting.Window_lshgc_F_rad
+		F_rad = np.where(SHGC > 0.5, self.settings.Window_hshgc_F_rad, self.settings.Window_lshgc_F_rad)
 		cvhg = (1-F_rad)*hg
-		df['ConvHG'] = cvhg
 		
 		# Radiant Heat Gain
 		rhg = hg - cvhg
-		df['RadHG'] = rhg
 
 		# NS-RTS
-		ns_rts = self.host.NS_RTS['NS-RTS'].tolist()
-		df['NS-RTS'] = ns_rts
+		ns_rts = _rts_array(self.host.NS_RTS, 'NS-RTS')
 
 		# RTS_CL
-		rts_cl = TimeSeriesMethod(ts=ns_rts, heat_load=rhg.m.tolist(), id=self.ID, tstype='NS-RTS')
-		df['RTS_CL'] = rts_cl
+		rts_cl = TimeSeriesMethod(ts=ns_rts, heat_load=rhg, id=self.ID, tstype='NS-RTS', export=self.settings.tsm_export).to_numpy()
 
 		# Total Cooling Load
-		total_cl = di_CL + cvhg.m + rts_cl
-		df['TOTAL_CL'] = total_cl
+		total_cl = di_CL + cvhg + rts_cl
 
-		self.cooling_load_df = df		
-		return df
+		self.cooling_load = ResultRecord({'LST': LST, 'qbHG': qb, 'S-RTS': s_rts, 'di_CL': di_CL,
+										  'qdHG': qd, 'CondHG': cdhg, 'Heat Gain': hg, 'ConvHG': cvhg,
+										  'RadHG': rhg, 'NS-RTS': ns_rts, 'RTS_CL': rts_cl, 'TOTAL_CL': total_cl})
+		return self.cooling_load
+
+	def sunlit_fraction(self) -> np.ndarray:
+		"""Hourly sunlit fraction of the window with its `shading` (1 when the
+		sun is in front of an unshaded window), see `sunlit_fraction`."""
+		position_df = self.host.weather_data.position_df
+		gamma = position_df['Azimuth'].to_numpy() - self.host.psi.m
+		shading = self.shading if self.shading is not None else Shading()
+		return sunlit_fraction(position_df['Altitude'].to_numpy(), gamma, self.Width.to('m').m, self.Height.to('m').m, *shading.dimensions())
 
 	@property
 	def Width(self) -> Quantity:
@@ -271,7 +386,199 @@ class Window(Building_Element):
 		self._height = v
 		self.net_area = self._width * self._height
 
-def _solar_irradiance(element : Building_Element)-> pd.DataFrame:
+class Shading:
+	"""Exterior shading of a window by a horizontal overhang above it and a
+	vertical fin at each side (ASHRAE Fundamentals 2021, Chapter 15, Exterior
+	Shading). The overhang is taken as wider than the window and the fins as
+	higher than the window."""
+
+	def __init__(self, overhang: Quantity = Q_(0, 'm'),
+				 overhang_gap: Quantity = Q_(0, 'm'),
+				 fin: Quantity = Q_(0, 'm'),
+				 fin_gap: Quantity = Q_(0, 'm')) -> None:
+		"""
+		Parameters
+		----------
+		overhang:
+			Projection P_H of the overhang from the window plane.
+		overhang_gap:
+			Distance R_H from the overhang down to the top of the window.
+		fin:
+			Projection P_V of the side fins from the window plane.
+		fin_gap:
+			Distance R_W from a fin to the side of the window.
+		"""
+		self.overhang = overhang.to('m')
+		self.overhang_gap = overhang_gap.to('m')
+		self.fin = fin.to('m')
+		self.fin_gap = fin_gap.to('m')
+
+	def dimensions(self) -> tuple[float, float, float, float]:
+		"""P_H, R_H, P_V and R_W in m."""
+		return self.overhang.m, self.overhang_gap.m, self.fin.m, self.fin_gap.m
+
+	def __repr__(self) -> str:
+		return f'Shading(overhang={self.overhang:~P}, overhang_gap={self.overhang_gap:~P}, fin={self.fin:~P}, fin_gap={self.fin_gap:~P})'
+
+def sunlit_fraction(altitude: np.ndarray,
+					gamma: np.ndarray,
+					width: float | np.ndarray,
+					height: float | np.ndarray,
+					overhang: float | np.ndarray = 0.0,
+					overhang_gap: float | np.ndarray = 0.0,
+					fin: float | np.ndarray = 0.0,
+					fin_gap: float | np.ndarray = 0.0) -> np.ndarray:
+	"""Sunlit fraction of vertical windows shaded by an overhang and side fins
+	(ASHRAE Fundamentals 2021, Chapter 15, Exterior Shading). The shadow width
+	of a fin and the shadow height of the overhang are
+
+		S_W = P_V |tan γ|,	S_H = P_H tan Ω
+
+	with the profile angle Ω (see `geometry.profile_angle`), and the sunlit
+	area is A_SL = [W - (S_W - R_W)] [H - (S_H - R_H)], each factor between 0
+	and the window dimension. The fraction is 0 when the sun is behind the
+	window or below the horizon.
+
+	Parameters
+	----------
+	altitude:
+		Solar altitude β in degrees, (hours,).
+	gamma:
+		Surface-solar azimuth γ in degrees, (hours,) or (windows, hours); any
+		multiple of 360° is removed.
+	width, height, overhang, overhang_gap, fin, fin_gap:
+		W, H, P_H, R_H, P_V and R_W in m; scalars or (windows, 1) arrays.
+
+	Returns
+	-------
+	Sunlit fraction with the shape of `gamma`.
+	"""
+	# ψ of north-facing or rotated surfaces puts γ = φ - ψ outside [-180°, 180°)
+	gamma = (np.asarray(gamma, dtype=float) + 180) % 360 - 180
+	sunny = (altitude > 0) & (np.abs(gamma) < 90)
+	beta = np.radians(np.where(sunny, altitude, 0))
+	gamma = np.radians(np.where(sunny, gamma, 0))
+	S_H = overhang * np.tan(profile_angle(beta, gamma, 0.0))
+	S_W = fin * np.abs(np.tan(gamma))
+	sunlit_width = np.clip(width - (S_W - fin_gap), 0, width)
+	sunlit_height = np.clip(height - (S_H - overhang_gap), 0, height)
+	return np.where(sunny, sunlit_width * sunlit_height / (width * height), 0.0)
+
+class WindowGroup:
+	"""Many windows evaluated together, e.g. the glazing units of a curtain wall.
+
+	The areas, U-factors, shading coefficients, SHGC tables and host
+	orientations of the m windows are read once into (m, ...) arrays; call
+	`update` after editing the windows. The angle-dependent SHGC of all windows
+	and hours is one interpolation in the SHGC tables, and the S-RTS and NS-RTS
+	are applied as batched time series (one circulant product per distinct
+	RTS, see `coolingload.stacked_time_series`). The loads are the same as the
+	'TOTAL_CL' of `Window.update_cooling_load`, without the per-window tables.
+
+	```
+	group = WindowGroup(w for wall in walls for w in wall.windows.values())
+	group.update_cooling_load()		# one column per window
+	```
+	"""
+	def __init__(self, windows: Iterable[Window]) -> None:
+		self.windows = list(windows)
+		self.cooling_load_df: pd.DataFrame | None = None
+		self.update()
+
+	def update(self) -> None:
+		"""Reads the inputs of the windows into the arrays."""
+		windows = self.windows
+		self.IDs = [w.ID for w in windows]
+		self.area = np.array([[_magnitude(w.net_area)] for w in windows], dtype=float)
+		self.UA = np.array([[_magnitude(w.U * w.net_area)] for w in windows], dtype=float)
+		self.SC = np.array([[w.SC] for w in windows], dtype=float)
+		self.SHGCh = np.array([[w.SHGCh] for w in windows], dtype=float)
+		self.SHGCd = np.array([w.SHGCd for w in windows], dtype=float).reshape(len(windows), SHGC_ANGLES.size)
+		self.psi = np.array([w.host.psi.m for w in windows], dtype=float)
+		self.sigma = np.array([w.host.sigma.m for w in windows], dtype=float)
+		self.shaded = np.array([w.shading is not None for w in windows])
+		self.shading = np.array([[w.Width.to('m').m, w.Height.to('m').m, *(w.shading.dimensions() if w.shading is not None else (0.0,) * 4)]
+								 for w in windows], dtype=float).reshape(len(windows), 6)
+
+	def __len__(self) -> int:
+		return len(self.windows)
+
+	def SHGC(self, incidence: np.ndarray) -> np.ndarray:
+		"""Angle-dependent SHGC at the incidence angles (R × m, hours) in degrees
+		of R copies of the windows, interpolated linearly in the SHGC tables of
+		all windows at once. Angles above 90° take the value at 0°, like
+		`Window.update_cooling_load` (there is no beam irradiance then)."""
+		incidence = np.clip(np.where(incidence > 90, 0, incidence), 0, 90)
+		table = np.tile(self.SHGCd, (incidence.shape[0] // len(self), 1))
+		i = np.clip(np.searchsorted(SHGC_ANGLES, incidence, side='right') - 1, 0, SHGC_ANGLES.size - 2)
+		t = (incidence - SHGC_ANGLES[i]) / (SHGC_ANGLES[i + 1] - SHGC_ANGLES[i])
+		lower = np.take_along_axis(table, i, axis=1)
+		upper = np.take_along_axis(table, i + 1, axis=1)
+		return lower + t * (upper - lower)
+
+	def loads(self,
+			  irradiance: dict[str, np.ndarray],
+			  T_out: np.ndarray,
+			  ns_rts: np.ndarray | pd.DataFrame | None,
+			  s_rts: np.ndarray | pd.DataFrame | None,
+			  settings: Setting | type[Setting],
+			  time_series,
+			  U: float | np.ndarray = 1.0,
+			  SHGC: float | np.ndarray = 1.0,
+			  SC: float | np.ndarray = 1.0,
+			  altitude: np.ndarray | None = None) -> np.ndarray:
+		"""Cooling loads (R × m, hours) for irradiance rows given for R copies of
+		the windows (R × m, hours), e.g. rotations or samples. Without `ns_rts`
+		or `s_rts` the NS-RTS of the host walls or the S-RTS of the windows are
+		used. `U`, `SHGC` and `SC` are factors on the window values, scalars or
+		(R × m, 1) arrays. `time_series` is the time series function for the
+		weather data, see `coolingload.stacked_time_series`. The solar
+		`altitude` (hours) in degrees is needed for windows with shading."""
+		R = irradiance['Incidence'].shape[0] // len(self)
+		SHGC_table = self.SHGC(irradiance['Incidence']) * SHGC
+		Etb = irradiance['Etb(W/m2)']
+		if self.shaded.any():
+			Etb = Etb * self.sunlit_fraction(altitude, irradiance['γ-gamma'])
+		q_b = np.tile(self.area * self.SC, (R, 1)) * SC * Etb * SHGC_table
+		q_d = np.tile(self.area * self.SHGCh, (R, 1)) * SHGC * (irradiance['Etd(W/m2)'] + irradiance['Etr(W/m2)'])
+		hg = q_d + np.tile(self.UA, (R, 1)) * U * (T_out - settings.Inside_DB.m)
+		F_rad = np.where(SHGC_table > 0.5, settings.Window_hshgc_F_rad, settings.Window_lshgc_F_rad)
+		s_rts = _stack_rts(s_rts, (w.S_RTS for w in self.windows), 'S-RTS')
+		ns_rts = _stack_rts(ns_rts, (w.host.NS_RTS for w in self.windows), 'NS-RTS')
+		if R > 1:
+			s_rts = s_rts if s_rts.ndim == 1 else np.tile(s_rts, (R, 1))
+			ns_rts = ns_rts if ns_rts.ndim == 1 else np.tile(ns_rts, (R, 1))
+		di_cl = time_series(s_rts, q_b)
+		rts_cl = time_series(ns_rts, F_rad * hg)
+		return di_cl + (1 - F_rad) * hg + rts_cl
+
+	def sunlit_fraction(self, altitude: np.ndarray, gamma: np.ndarray) -> np.ndarray:
+		"""Sunlit fraction (R × m, hours) of R copies of the windows at the solar
+		`altitude` (hours) and surface-solar azimuths `gamma` (R × m, hours) in
+		degrees, see `sunlit_fraction`; 1 for windows without shading."""
+		rows = np.tile(self.shading, (gamma.shape[0] // len(self), 1))
+		shaded = np.tile(self.shaded, gamma.shape[0] // len(self))
+		fraction = np.ones_like(gamma, dtype=float)
+		fraction[shaded] = sunlit_fraction(altitude, gamma[shaded], *rows[shaded].T[:, :, None])
+		return fraction
+
+	def update_cooling_load(self,
+							ns_rts: np.ndarray | pd.DataFrame | None = None,
+							s_rts: np.ndarray | pd.DataFrame | None = None) -> pd.DataFrame:
+		"""Hourly cooling load of every window (one column per window ID), with
+		the weather data of the first window's host and the settings of the
+		first window; see `loads` for the RTS."""
+		weather_data = self.windows[0].host.weather_data
+		settings = self.windows[0].settings
+		if weather_data.position_df is None:
+			weather_data.update_sun_position()
+		irradiance = irradiance_cache.stack(weather_data, self.psi, self.sigma, settings.rho)
+		loads = self.loads(irradiance, weather_data.T_db_array, ns_rts, s_rts, settings, _time_series_method(weather_data),
+						   altitude=weather_data.position_df['Altitude'].to_numpy())
+		self.cooling_load_df = pd.DataFrame(loads.T, columns=self.IDs)
+		return self.cooling_load_df
+
+def _solar_irradiance(element : Building_Element)-> ResultRecord:
 	"""ASHRAE Fundamentals 2021, p14.11
 	Solar Angles Related to Receiving Surfaces
 	The tilt angle Σ(sigma) (also called slope) is the angle between the surface and the horizontal
@@ -283,104 +590,160 @@ def _solar_irradiance(element : Building_Element)-> pd.DataFrame:
 	Note that, surface azimuth is defined as relative to south in both the northern and southern
 	hemispheres.
 	"""
-	df = element.weather_data.position_df[['LST','Eb(W/m2)','Ed(W/m2)']].copy()	
+	position_df = element.weather_data.position_df
+	irradiance = irradiance_cache.get(element.weather_data, element.psi.m, element.sigma.m, element.settings.rho)
+	columns = {c: position_df[c] for c in ('LST', 'Eb(W/m2)', 'Ed(W/m2)')}
+	for column in ('γ-gamma', 'Incidence', 'Etb(W/m2)', 'Y', 'Etd(W/m2)', 'Etr(W/m2)', 'Et(W/m2)'):
+		columns[column] = irradiance[column]
+	return ResultRecord(columns)
+
+def surface_irradiance(position_df: pd.DataFrame, psi: float | np.ndarray, sigma: float | np.ndarray, rho: float | None = None) -> dict[str, np.ndarray]:
+	"""Clear-sky irradiance on one or more receiving surfaces, see `_solar_irradiance`.
+
+	Parameters
+	----------
+	position_df:
+		Sun position table of `WeatherData.update_sun_position`.
+	psi:
+		Surface azimuth(s) in degrees.
+	sigma:
+		Tilt angle(s) in degrees.
+	rho:
+		Ground reflectance, default `Setting.rho`.
+
+	Returns
+	-------
+	Dictionary of arrays keyed by the column names of `_solar_irradiance`. With
+	scalar `psi` and `sigma` the arrays have the shape of the hours in
+	`position_df`; with arrays of m surfaces they have the shape (m, hours).
+	"""
+	psi = np.asarray(psi, dtype=float)[..., None]
+	sigma = np.deg2rad(np.asarray(sigma, dtype=float))[..., None]
 
 	"""The surface-solar azimuth angle γ(gamma) is defined as the angular difference between
 	the solar azimuth Φ(phi) and the surface azimuth Ψ(psi)
-	Values of γ(gamma) greater than 90° or less than –90° indicate that the surface is in the shade."""	
-	gamma = element.weather_data.position_df['Azimuth'].to_numpy() - element.psi.m
-	sigma = element.sigma.m
-	df['γ-gamma'] = gamma
-	
+	Values of γ(gamma) greater than 90° or less than –90° indicate that the surface is in the shade."""
+	gamma = position_df['Azimuth'].to_numpy() - psi
+
 	# Surface Incidence
-	beta = element.weather_data.position_df['Altitude'].to_numpy()
-	theta = np.arccos(np.cos(np.deg2rad(beta))*np.cos(np.deg2rad(gamma))*np.sin(np.deg2rad(sigma)) 
-			+ np.sin(np.deg2rad(beta))*np.cos(np.deg2rad(sigma)))
-	df['Incidence'] = np.rad2deg(theta)
-	
+	beta = np.deg2rad(position_df['Altitude'].to_numpy())
+	theta = np.arccos(np.cos(beta)*np.cos(np.deg2rad(gamma))*np.sin(sigma) + np.sin(beta)*np.cos(sigma))
+
 	# Direct Beam solar
-	Eb = df['Eb(W/m2)'].to_numpy()
-	Etb = Eb*np.cos(theta)
-	Etb[Etb <= 0] = 0
-	df['Etb(W/m2)'] = Etb
-	
+	Eb = position_df['Eb(W/m2)'].to_numpy()
+	Etb = np.maximum(Eb*np.cos(theta), 0)
+
 	# Diffuse Solar HeatGain
-	Y = 0.55 + 0.437*np.cos(theta) + 0.313*(np.cos(theta)**2)
-	Y[Y < 0.45] = 0.45
-	df['Y'] = Y
-	Ed = df['Ed(W/m2)'].to_numpy()
-	Etd = Ed*(Y*np.sin(np.deg2rad(sigma)) + np.cos(np.deg2rad(sigma))) if sigma <= 90 else Ed*Y*np.sin(np.deg2rad(sigma))
-	df['Etd(W/m2)'] = Etd
-	
+	Y = np.maximum(0.55 + 0.437*np.cos(theta) + 0.313*(np.cos(theta)**2), 0.45)
+	Ed = position_df['Ed(W/m2)'].to_numpy()
+	Etd = np.where(sigma <= np.pi/2, Ed*(Y*np.sin(sigma) + np.cos(sigma)), Ed*Y*np.sin(sigma))
+
 	# Ground Diffuse
 	# ρ (rho) : Ground Reflectance of Foreground Surfaces
-	Etr = (Eb*np.sin(np.deg2rad(beta)) + Ed) * Setting.rho * (1-np.cos(np.deg2rad(sigma)))/2
-	df['Etr(W/m2)'] = Etr
+	rho = Setting.rho if rho is None else rho
+	Etr = (Eb*np.sin(beta) + Ed) * rho * (1-np.cos(sigma))/2
 
 	# Total Surface Irradiance
 	Et = Etb + Etd + Etr
-	df['Et(W/m2)'] = Et
-	# df.set_index('LST', inplace=True, drop=False)
-	return df
+	irradiance = {'γ-gamma': gamma, 'Incidence': np.rad2deg(theta), 'Etb(W/m2)': Etb, 'Y': Y,
+				  'Etd(W/m2)': Etd, 'Etr(W/m2)': Etr, 'Et(W/m2)': Et}
+	shape = np.broadcast_shapes(*(v.shape for v in irradiance.values()))
+	return {k: np.array(np.broadcast_to(v, shape)) for k, v in irradiance.items()}
+
+class IrradianceCache:
+	"""Surface irradiance profiles (see `surface_irradiance`) shared by all surfaces
+	with the same orientation (psi, sigma) under the same weather data, so that a
+	facade of identical panels computes one profile. The cached arrays are
+	read-only.
+
+	The profiles of a `WeatherData` are dropped when its `position_df` is replaced
+	(`update_sun_position`, e.g. after a change of date) and when the
+	`WeatherData` object itself is garbage collected.
+	"""
+	def __init__(self) -> None:
+		self._entries: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, weather_data: WeatherData, psi: float, sigma: float, rho: float | None = None) -> dict[str, np.ndarray]:
+		"""Irradiance of one surface with azimuth `psi` and tilt `sigma` in degrees
+		and ground reflectance `rho` (default `Setting.rho`)."""
+		position_df = weather_data.position_df
+		entry = self._entries.get(weather_data)
+		if entry is None or entry[0] is not position_df:
+			entry = (position_df, {})
+			self._entries[weather_data] = entry
+		key = (float(psi), float(sigma), Setting.rho if rho is None else rho)
+		irradiance = entry[1].get(key)
+		if irradiance is None:
+			self.misses += 1
+			irradiance = surface_irradiance(position_df, key[0], key[1], key[2])
+			for v in irradiance.values():
+				v.flags.writeable = False
+			entry[1][key] = irradiance
+		else:
+			self.hits += 1
+		return irradiance
 
-def _external_cooling_load(element : Building_Element, long_wave_correction : float) -> pd.DataFrame:
-	df = element.cooling_load_df
+	def stack(self, weather_data: WeatherData, psi: list[float], sigma: list[float], rho: float | None = None) -> dict[str, np.ndarray]:
+		"""Irradiance of m surfaces as (m, hours) arrays (writable copies); every
+		distinct orientation is calculated once."""
+		keys = [(float(p), float(s)) for p, s in zip(psi, sigma)]
+		unique = {k: i for i, k in enumerate(dict.fromkeys(keys))}
+		profiles = [self.get(weather_data, *k, rho) for k in unique]
+		index = [unique[k] for k in keys]
+		return {c: np.stack([p[c] for p in profiles])[index] for c in profiles[0]}
+
+	def clear(self) -> None:
+		self._entries.clear()
+		self.hits = 0
+		self.misses = 0
+
+irradiance_cache = IrradianceCache()
+
+def _external_cooling_load(element : Building_Element, long_wave_correction : float) -> ResultRecord:
+	LST = element.solar_irradiance['LST']
+	Et = element.solar_irradiance['Et(W/m2)']
 
 	# Outdoor Temperature from Weather data
-	Tout = np.array([i.m for i in element.weather_data.T_db_prof])
-	df['Out_T'] = Tout
+	Tout = element.weather_data.T_db_array
 
 	# Sol-air temperature
-	Et = df['Et(W/m2)'].to_numpy()
 	Te = Tout + element.surface_absorptance * Et - long_wave_correction
-	df['Sol-Air_T'] = Te
 
 	# Heat Input
-	qi = element.U * element.net_area * (Te - Setting.Inside_DB.m)
-	df['Heat Input'] = qi.m
-
-	# Conduction Time Series
-	df['CTS'] = element.CTS
+	qi = _magnitude(element.U * element.net_area * (Te - element.settings.Inside_DB.m))
 
 	# Heat Gain
-	hg = TimeSeriesMethod(ts=element.CTS, heat_load=qi.m.tolist(), id=element.ID , tstype='CTS')
-	df['Heat Gain'] = hg
+	hg = TimeSeriesMethod(ts=element.CTS, heat_load=qi, id=element.ID , tstype='CTS', export=element.settings.tsm_export).to_numpy()
 
 	# Convective Heat Gain
 	cvhg = (1-element.F_rad)*hg
-	df['ConvHG'] = cvhg
 
 	# Radiant Heat Gain
 	rhg = element.F_rad*hg
-	df['RadHG'] = rhg
 
 	# NS-RTS
-	ns_rts=element.NS_RTS['NS-RTS'].tolist()
-	df['NS-RTS'] = ns_rts
+	ns_rts = _rts_array(element.NS_RTS, 'NS-RTS')
 
 	# RTS_CL
-	rts_cl = TimeSeriesMethod(ts=ns_rts, heat_load=rhg.tolist(), id=element.ID, tstype='NS-RTS')
-	df['RTS_CL'] = rts_cl
+	rts_cl = TimeSeriesMethod(ts=ns_rts, heat_load=rhg, id=element.ID, tstype='NS-RTS', export=element.settings.tsm_export).to_numpy()
 
 	# Total Cooling Load
 	total_cl = cvhg + rts_cl
-	df['TOTAL_CL'] = total_cl
-	
-	return df
 
-def _internal_cooling_load(element : Building_Element) -> pd.DataFrame:
-	df = element.cooling_load_df
+	return ResultRecord({'LST': LST, 'Et(W/m2)': Et, 'Out_T': Tout, 'Sol-Air_T': Te, 'Heat Input': qi,
+						 'CTS': element.CTS, 'Heat Gain': hg, 'ConvHG': cvhg, 'RadHG': rhg,
+						 'NS-RTS': ns_rts, 'RTS_CL': rts_cl, 'TOTAL_CL': total_cl})
 
-	# Outdoor Temperature from Temperature Diff. with adjacent space
-	Tout = Setting.Inside_DB + element.delta_T
-	df['Out_T'] = Tout.magnitude
+def _internal_cooling_load(element : Building_Element) -> ResultRecord:
+	LST = element.weather_data.position_df['LST']
 
-	# Indoor temperature
-	df['In_T'] = Setting.Inside_DB.m
+	# Outdoor Temperature from Temperature Diff. with adjacent space
+	T_in = element.settings.Inside_DB
+	Tout = (T_in + element.delta_T).magnitude
 
 	# Total Cooling Load
-	Te=df['Out_T'].to_numpy()
-	qi = element.U * element.net_area * (Te - Setting.Inside_DB.m)
-	df['TOTAL_CL'] = qi.m
+	qi = _magnitude(element.U * element.net_area * (Tout - T_in.m))
 
-	return df
\ No newline at end of file
+	return ResultRecord({'LST': LST, 'Out_T': Tout, 'In_T': T_in.m, 'TOTAL_CL': qi})
@@ -1,20 +1,63 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
+from datetime import date as Date
 import pandas as pd
 import numpy as np
 from .. import Quantity
 from .equipment import Equipment
 from .lighting import Lighting
-from .people import People
-from .coolingload import TimeSeriesMethod
+from .people import People, VentilationRates
+from .coolingload import Setting, TimeSeriesMethod
+from .climatic import WeatherData, humidity_ratio
+from .schedule import Schedule
 
 Q_ = Quantity
 
+def _hourly_unit_gains(items: Iterable, hours: int = 24, start: Date | None = None) -> np.ndarray:
+    """Returns the summed radiative sensible, convective sensible and latent
+    heat gain of `items` in Watts as an array with one row per hour and one
+    column per component. Every item provides its `unit_heat_gain` and its
+    `schedule_vector`; items that share the same schedule function share one
+    schedule vector.
+    """
+    items = list(items)
+    if not items:
+        return np.zeros((hours, 3))
+    vectors = {}
+    schedules = np.empty((len(items), hours))
+    unit_gains = np.empty((len(items), 3))
+    for k, item in enumerate(items):
+        try:
+            vector = vectors.get(item.schedule)
+            if vector is None:
+                vector = vectors[item.schedule] = item.schedule_vector(hours, start)
+        except TypeError:  # unhashable schedule object
+            vector = item.schedule_vector(hours, start)
+        schedules[k] = vector
+        unit_gains[k] = item.unit_heat_gain()
+    return schedules.T @ unit_gains
+
+def outdoor_air_load(weather_data: WeatherData, settings: Setting | type[Setting] = Setting) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the sensible and the latent cooling load in W per L/s of outdoor
+    air at every hour of `weather_data`, against the indoor conditions of
+    `settings`: 1.23·Δt and 3010·ΔW for standard air (ASHRAE Fundamentals 2021,
+    Chapter 16). The outdoor humidity ratio of all hours is one array
+    evaluation (see `WeatherData.W_array`).
+    """
+    W_in = humidity_ratio(settings.Inside_DB.m, weather_data.pressure.to('Pa').m, RH=settings.Inside_RH)
+    sensible = 1.23 * (weather_data.T_db_array - settings.Inside_DB.m)
+    latent = 3010 * (weather_data.W_array - W_in)
+    return sensible, latent
+
 class InternalHeatGain(ABC):
+    settings: Setting | type[Setting] = Setting  # see `Setting`; a `Zone` assigns its own
 
-    def __init__(self, ID: str, ns_rts: pd.DataFrame | None, usage_profile: list| None):
+    def __init__(self, ID: str, ns_rts: pd.DataFrame | None, usage_profile: list | Schedule | None):
         self.ID = ID
         # Default Profile - Operation is from 8:00 to 17:00.
-        self.usage_profile =  usage_profile if usage_profile is not None else [0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,0]
+        if usage_profile is None:
+            usage_profile = [0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,0]
+        self.schedule = usage_profile if isinstance(usage_profile, Schedule) else Schedule(usage_profile)
         self.cooling_load_df = pd.DataFrame(self.usage_profile, columns=['UPro'])
         self.cooling_load_df['NS-RTS'] = ns_rts if ns_rts is not None else [100,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]
         
@@ -32,12 +75,43 @@ class InternalHeatGain(ABC):
         """
         ...
 
-    def usage_schedule(self, t_sol_sec: float) -> float:
-        return self.usage_profile[int(t_sol_sec/3600)]
+    @abstractmethod
+    def radiant_convective(self, hours: int = 24, start: Date | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the hourly radiative heat gain, which is delayed by the
+        NS-RTS, and the hourly heat gain that becomes cooling load immediately
+        (convective sensible plus latent), both in Watts, over `hours` hours
+        (the design day by default; from midnight of date `start` if given,
+        see `hourly_Q_dot`).
+        """
+        ...
+
+    def hourly_Q_dot(self, hours: int = 24, start: Date | None = None) -> np.ndarray:
+        """Returns `Q_dot` at every hour of the design day as an array with one
+        row per hour and one column per heat gain component. Items with a
+        `Schedule` are evaluated from midnight of date `start` if given.
+        """
+        return np.array([self.Q_dot((i % 24) * 3600) for i in range(hours)])
+
+    @property
+    def usage_profile(self) -> list[float]:
+        """Hourly values of the design day (weekday) usage profile."""
+        return self.schedule.hourly().tolist()
+
+    @usage_profile.setter
+    def usage_profile(self, usage_profile: list) -> None:
+        self.schedule.update(weekday=usage_profile)
+
+    @property
+    def usage_schedule(self) -> Schedule:
+        """The usage `Schedule` of this heat gain, to be passed as the schedule
+        of the objects inside it so that they follow `UpdateUsageProfile`."""
+        return self.schedule
 
     def UpdateUsageProfile(self, usage_profile: list) -> None:
+        """Replaces the weekday profile of the usage schedule (24 hourly values
+        or one value per timestep of the schedule)."""
         self.usage_profile = usage_profile
-        self.cooling_load_df['UPro'] = usage_profile
+        self.cooling_load_df['UPro'] = self.usage_profile
         
     def Update_ns_rts(self, ns_rts: pd.DataFrame) -> None:
         self.cooling_load_df['NS-RTS'] = ns_rts
@@ -81,21 +155,24 @@ class EquipmentHeatGain(InternalHeatGain):
             Q_dot_lat += eqp.Q_dot_lat.to('W').m
         return Q_dot_sen, Q_dot_sen_rd, Q_dot_sen_cv, Q_dot_lat 
 
+    def hourly_Q_dot(self, hours: int = 24, start: Date | None = None) -> np.ndarray:
+        Q_rd, Q_cv, Q_lat = _hourly_unit_gains(self.equipment.values(), hours, start).T
+        return np.column_stack([Q_rd + Q_cv, Q_rd, Q_cv, Q_lat])
+
+    def radiant_convective(self, hours: int = 24, start: Date | None = None) -> tuple[np.ndarray, np.ndarray]:
+        Q = self.hourly_Q_dot(hours, start)
+        return Q[:, 1], Q[:, 2] + Q[:, 3]
+
     def update_cooling_load(self):
-        Q_dot_sen, Q_dot_sen_rd, Q_dot_sen_cv, Q_dot_lat = [],[],[],[]
-        for i in range(24):
-            Q = self.Q_dot(i * 3600)
-            Q_dot_sen.append(Q[0])
-            Q_dot_sen_rd.append(Q[1])
-            Q_dot_sen_cv.append(Q[2])            
-            Q_dot_lat.append(Q[3])
-        self.cooling_load_df['SenHG'] = Q_dot_sen
-        self.cooling_load_df['SenToRad'] = Q_dot_sen_rd
-        self.cooling_load_df['SenToCon'] = Q_dot_sen_cv
-        self.cooling_load_df['LatHG'] = Q_dot_lat
+        Q = self.hourly_Q_dot()
+        Q_dot_sen_rd = Q[:, 1].tolist()
+        self.cooling_load_df['SenHG'] = Q[:, 0]
+        self.cooling_load_df['SenToRad'] = Q[:, 1]
+        self.cooling_load_df['SenToCon'] = Q[:, 2]
+        self.cooling_load_df['LatHG'] = Q[:, 3]
         rts_cooling_load = TimeSeriesMethod(ts = self.cooling_load_df['NS-RTS'].tolist(), 
                                             heat_load = Q_dot_sen_rd,
-                                            id = self.ID, tstype='NS-RTS')
+                                            id = self.ID, tstype='NS-RTS', export=self.settings.tsm_export)
         rts_cooling_load.columns = ['RTS_CL']
         self.cooling_load_df['RTS_CL'] = rts_cooling_load
         Total_Cooling_Load = self.cooling_load_df['LatHG'] + self.cooling_load_df['SenToCon'] + rts_cooling_load
@@ -138,19 +215,23 @@ class LightingHeatGain(InternalHeatGain):
             Q_dot_sen_cv += (1 - light.F_rad.to('').m) * Q_dot_light
         return Q_dot_sen_cv, Q_dot_sen_rd, 0.0
 
+    def hourly_Q_dot(self, hours: int = 24, start: Date | None = None) -> np.ndarray:
+        Q_rd, Q_cv, Q_lat = _hourly_unit_gains(self.lighting.values(), hours, start).T
+        return np.column_stack([Q_cv, Q_rd, Q_lat])
+
+    def radiant_convective(self, hours: int = 24, start: Date | None = None) -> tuple[np.ndarray, np.ndarray]:
+        Q = self.hourly_Q_dot(hours, start)
+        return Q[:, 1], Q[:, 0]
+
     def update_cooling_load(self):
-        Q_total,Q_con,Q_rad = [],[],[]
-        for i in range(24):
-            Q = self.Q_dot(i * 3600)            
-            Q_con.append(Q[0])
-            Q_rad.append(Q[1])
-            Q_total.append(Q[0]+Q[1])
-        self.cooling_load_df['TotalHG'] = Q_total
-        self.cooling_load_df['ConHG'] = Q_con
-        self.cooling_load_df['RadHG'] = Q_rad
+        Q = self.hourly_Q_dot()
+        Q_rad = Q[:, 1].tolist()
+        self.cooling_load_df['TotalHG'] = Q[:, 0] + Q[:, 1]
+        self.cooling_load_df['ConHG'] = Q[:, 0]
+        self.cooling_load_df['RadHG'] = Q[:, 1]
         rts_cooling_load = TimeSeriesMethod(ts = self.cooling_load_df['NS-RTS'].tolist(), 
                                             heat_load = Q_rad,
-                                            id = self.ID, tstype='NS-RTS')
+                                            id = self.ID, tstype='NS-RTS', export=self.settings.tsm_export)
         rts_cooling_load.columns = ['RTS_CL']
         self.cooling_load_df['RTS_CL'] = rts_cooling_load
 
@@ -178,24 +259,110 @@ class PeopleHeatGain(InternalHeatGain):
     def Q_dot(self, t_sol_sec: float) -> tuple[float, float, float, float]:
         return self.occupants.calculate_heat_gain(t_sol_sec)
 
+    def hourly_Q_dot(self, hours: int = 24, start: Date | None = None) -> np.ndarray:
+        Q_rd, Q_cv, Q_lat = _hourly_unit_gains([self.occupants], hours, start).T
+        return np.column_stack([Q_rd + Q_cv, Q_rd, Q_cv, Q_lat])
+
+    def radiant_convective(self, hours: int = 24, start: Date | None = None) -> tuple[np.ndarray, np.ndarray]:
+        Q = self.hourly_Q_dot(hours, start)
+        return Q[:, 1], Q[:, 2] + Q[:, 3]
+
     def update_cooling_load(self):
-        Q_dot_sen, Q_dot_sen_rd, Q_dot_sen_cv, Q_dot_lat = [],[],[],[]
-        for i in range(24):
-            Q = self.Q_dot(i * 3600)
-            Q_dot_sen.append(Q[0])
-            Q_dot_sen_rd.append(Q[1])
-            Q_dot_sen_cv.append(Q[2])            
-            Q_dot_lat.append(Q[3])
-        self.cooling_load_df['SenHG'] = Q_dot_sen
-        self.cooling_load_df['SenToRad'] = Q_dot_sen_rd
-        self.cooling_load_df['SenToCon'] = Q_dot_sen_cv
-        self.cooling_load_df['LatHG'] = Q_dot_lat
+        Q = self.hourly_Q_dot()
+        Q_dot_sen_rd = Q[:, 1].tolist()
+        self.cooling_load_df['SenHG'] = Q[:, 0]
+        self.cooling_load_df['SenToRad'] = Q[:, 1]
+        self.cooling_load_df['SenToCon'] = Q[:, 2]
+        self.cooling_load_df['LatHG'] = Q[:, 3]
         rts_cooling_load = TimeSeriesMethod(ts = self.cooling_load_df['NS-RTS'].tolist(), 
                                             heat_load = Q_dot_sen_rd,
-                                            id = self.ID, tstype='NS-RTS')
+                                            id = self.ID, tstype='NS-RTS', export=self.settings.tsm_export)
         rts_cooling_load.columns = ['RTS_CL']
         self.cooling_load_df['RTS_CL'] = rts_cooling_load
         Total_Cooling_Load = self.cooling_load_df['LatHG'] + self.cooling_load_df['SenToCon'] + rts_cooling_load
         Total_Cooling_Load.columns = ['TOTAL_CL']
         self.cooling_load_df['TOTAL_CL'] = Total_Cooling_Load
         return self.cooling_load_df
+
+class VentilationHeatGain(InternalHeatGain):
+    """Represents the cooling load of the outdoor air that enters the space as
+    ventilation air and by infiltration. The ventilation airflow follows the
+    ventilation rate procedure of ASHRAE Standard 62.1 (§6.2):
+    V_bz = Rp·Pz + Ra·Az (Eq. 6-1) and V_oz = V_bz / Ez (Eq. 6-2), with the
+    rates Rp and Ra of the space type in `people.human_vrp_df`, and is scaled by
+    the usage profile; infiltration is constant. The sensible and latent load of
+    the outdoor air becomes cooling load immediately (see `outdoor_air_load`).
+
+    A `Zone` gives the heat gain its weather data and settings; on its own they
+    are set with the attributes `weather_data` and `settings`.
+    """
+    def __init__(self,
+                 ID: str,
+                 floor_area: Quantity,
+                 occupants: float,
+                 space_type: str = 'Office',
+                 E_z: float = 1.0,
+                 infiltration: Quantity = Q_(0, 'L / s'),
+                 usage_profile: list | Schedule | None = None):
+        """
+        Parameters
+        ----------
+        floor_area:
+            Zone floor area Az.
+        occupants:
+            Zone population Pz.
+        space_type:
+            Space type of table `people.human_vrp_df`.
+        E_z:
+            Zone air distribution effectiveness (ASHRAE 62.1 Table 6-4).
+        infiltration:
+            Infiltration airflow, present at all hours.
+        usage_profile:
+            Fraction of the design ventilation airflow at every hour.
+        """
+        super().__init__(ID, None, usage_profile)
+        self.floor_area = floor_area
+        self.occupants = occupants
+        self.space_type = space_type
+        self.E_z = E_z
+        self.infiltration = infiltration
+        self.weather_data: WeatherData | None = None
+
+    @property
+    def outdoor_airflow(self) -> Quantity:
+        """Design zone outdoor airflow V_oz."""
+        Rp, Ra = VentilationRates(self.space_type)
+        V_bz = Q_(Rp, 'ft ** 3 / min') * self.occupants + Q_(Ra, 'ft ** 3 / min / ft ** 2') * self.floor_area
+        return (V_bz / self.E_z).to('L / s')
+
+    def airflow(self, hours: int = 24, start: Date | None = None) -> np.ndarray:
+        """Returns the outdoor airflow (ventilation and infiltration) in L/s at
+        every hour, from midnight of date `start` if given."""
+        return self.schedule.hourly(hours, start) * self.outdoor_airflow.m + self.infiltration.to('L / s').m
+
+    def Q_dot(self, t_sol_sec: float) -> tuple[float, float, float]:
+        sensible, latent = self.hourly_Q_dot()[int(t_sol_sec // 3600) % 24]
+        return sensible, 0.0, latent
+
+    def hourly_Q_dot(self, hours: int | None = None, start: Date | None = None) -> np.ndarray:
+        """Returns the sensible and the latent load in Watts (columns) at every
+        hour of the weather data (all hours if `hours` is None), with the usage
+        schedule from midnight of date `start` if given."""
+        sensible, latent = outdoor_air_load(self.weather_data, self.settings)
+        hours = sensible.size if hours is None else hours
+        Q = self.airflow(hours, start)
+        return np.column_stack([Q * np.resize(sensible, hours), Q * np.resize(latent, hours)])
+
+    def radiant_convective(self, hours: int = 24, start: Date | None = None) -> tuple[np.ndarray, np.ndarray]:
+        Q = self.hourly_Q_dot(hours, start)
+        return np.zeros(hours), Q.sum(axis=1)
+
+    def update_cooling_load(self):
+        start = self.weather_data.schedule_start
+        Q = self.hourly_Q_dot(start=start)
+        self.cooling_load_df = pd.DataFrame({'UPro': self.schedule.hourly(len(Q), start),
+                                             'Airflow': self.airflow(len(Q), start),
+                                             'SenHG': Q[:, 0],
+                                             'LatHG': Q[:, 1],
+                                             'TOTAL_CL': Q.sum(axis=1)})
+        return self.cooling_load_df
@@ -2,8 +2,10 @@
 import numpy as np
 from abc import ABC, abstractmethod
 from typing import Callable
+from datetime import date as Date
 from .. import Quantity
 from pyMEP.hvac.coolingload import Setting
+from pyMEP.hvac.time import schedule_vector
 
 Q_ = Quantity
 
@@ -56,6 +58,23 @@ class Lighting(ABC):
     def calculate_heat_gain(self, t_sol_sec: float) -> None:
         ...
 
+    @abstractmethod
+    def unit_light_power(self) -> float:
+        """Returns the lighting heat gain in Watts when the schedule value is 1."""
+        ...
+
+    def unit_heat_gain(self) -> tuple[float, float, float]:
+        """Returns the radiative sensible, the convective sensible and the
+        latent heat gain in Watts when the schedule value is 1."""
+        Q_dot_light = self.unit_light_power()
+        F_rad = self.F_rad.to('').m
+        return F_rad * Q_dot_light, (1 - F_rad) * Q_dot_light, 0.0
+
+    def schedule_vector(self, hours: int = 24, start: Date | None = None) -> np.ndarray:
+        """Returns the schedule value at every hour as an array of length
+        `hours`, from midnight of date `start` if the schedule is a `Schedule`."""
+        return schedule_vector(self.schedule, hours, start)
+
 class LightingFixture(Lighting):
     """Represents a single lighting fixture or a group of lighting fixtures in
     a room. The light heat gain is calculated based on the lighting fixture's
@@ -120,6 +139,9 @@ class LightingFixture(Lighting):
         div_fac = self.schedule(t_sol_sec)
         self.Q_dot_light = div_fac * self.P_lamp * self.F_use.to('').m * self.F_allowance.to('').m
 
+    def unit_light_power(self) -> float:
+        return self.P_lamp.to('W').m * self.F_use.to('').m * self.F_allowance.to('').m
+
 class SpaceLighting(Lighting):
     """This class can be used to estimate the lighting gain on a
     per-square-metre basis (e.g., when final lighting plans are not available).
@@ -174,3 +196,6 @@ class SpaceLighting(Lighting):
     def calculate_heat_gain(self, t_sol_sec: float):
         div_fac = self.schedule(t_sol_sec)
         self.Q_dot_light = div_fac * self.F_space.to('').m * self.power_density * self.A_floor
+
+    def unit_light_power(self) -> float:
+        return self.F_space.to('').m * (self.power_density * self.A_floor).to('W').m
@@ -1,6 +1,9 @@
 ﻿import pandas as pd
+import numpy as np
 from typing import Callable
+from datetime import date as Date
 from .. import Quantity
+from .time import schedule_vector
 
 Q_ = Quantity
 
@@ -51,6 +54,12 @@ def LowV_F_Rad(activity:str, location:str) -> int:
 def HighV_F_Rad(activity:str, location:str) -> int:
 	return HumanHeatRate(activity, location)[3]
 
+def VentilationRates(space_type:str) -> tuple[float, float]:
+	"""Returns the people outdoor air rate Rp in cfm/person and the area outdoor
+	air rate Ra in cfm/ft² of `space_type` (ASHRAE Standard 62.1, Table 6-1)."""
+	rowdata = human_vrp_df[human_vrp_df['Space Types'].str.match(space_type)]
+	return float(rowdata['Rp'].values[0]), float(rowdata['Ra'].values[0])
+
 class People:
 
 	def __init__(self):
@@ -97,4 +106,15 @@ class People:
 		Q_dot_sen_rd = self.F_rad.to('').m * Q_dot_sen
 		Q_dot_sen_cv = Q_dot_sen - Q_dot_sen_rd
 		Q_dot_lat = self.schedule(t_sol_sec) * self.Q_dot_lat_person.m
-		return Q_dot_sen, Q_dot_sen_rd, Q_dot_sen_cv, Q_dot_lat
\ No newline at end of file
+		return Q_dot_sen, Q_dot_sen_rd, Q_dot_sen_cv, Q_dot_lat
+
+	def unit_heat_gain(self) -> tuple[float, float, float]:
+		"""Returns the radiative sensible, the convective sensible and the
+		latent heat gain in Watts of a single person."""
+		Q_dot_sen_rd = self.F_rad.to('').m * self.Q_dot_sen_person.m
+		return Q_dot_sen_rd, self.Q_dot_sen_person.m - Q_dot_sen_rd, self.Q_dot_lat_person.m
+
+	def schedule_vector(self, hours: int = 24, start: Date | None = None) -> np.ndarray:
+		"""Returns the number of people at every hour as an array of length
+		`hours`, from midnight of date `start` if the schedule is a `Schedule`."""
+		return schedule_vector(self.schedule, hours, start)
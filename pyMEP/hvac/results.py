@@ -0,0 +1,160 @@
+from __future__ import annotations
+import json
+import os
+import uuid
+from typing import Iterable, Iterator
+from urllib.parse import quote, unquote
+import numpy as np
+import pandas as pd
+
+class ResultStore:
+	"""Hourly cooling loads on disk instead of in memory, for runs whose results
+	do not fit as live DataFrames (e.g. annual loads of many buildings).
+
+	The store is a directory partitioned per building and zone:
+
+	- '<path>/building=<ID>/zone=<ID>/loads.*': the hourly load of every element,
+	  window and internal heat gain of the zone and the zone total 'TOTAL_CL'
+	  (the `Zone.cooling_load_df`);
+	- '<path>/building=<ID>/totals.*': the hourly total of every zone and the
+	  block load 'TOTAL_CL' (the `Building.cooling_load_df`).
+
+	IDs are percent-encoded in the directory names. Every table is a data file
+	and a '.json' file that names the data file and its columns. With
+	`format` 'npy' the data file is a NumPy array with one row per column,
+	memory-mapped when read; with 'parquet' (needs pyarrow or fastparquet) it
+	is a Parquet file. Either way `read` only loads the requested columns, so
+	reports and peak queries do not load the element loads.
+
+	```
+	store = ResultStore('results')					# or 'results.parquet'
+	building.update_cooling_load(store=store)		# written as the zones finish
+	store.peaks()									# zone peaks from 'TOTAL_CL' only
+	store.read('B1', 'Room 1', columns=['Wall A', 'TOTAL_CL'])
+	```
+	"""
+	TABLE = 'loads'
+	TOTALS = 'totals'
+
+	def __init__(self, path: str, format: str | None = None) -> None:
+		"""
+		Parameters
+		----------
+		path:
+			Directory of the store; created on the first write.
+		format:
+			'npy' or 'parquet'; 'parquet' if `path` ends with '.parquet',
+			otherwise 'npy'.
+		"""
+		self.path = path
+		if format is None:
+			format = 'parquet' if path.lower().endswith('.parquet') else 'npy'
+		if format not in ('parquet', 'npy'):
+			raise ValueError(f"format must be 'parquet' or 'npy', got {format!r}")
+		self.format = format
+		if self.format == 'parquet':
+			pd.io.parquet.get_engine('auto')		# ImportError if no Parquet engine is installed
+
+	def _directory(self, building: str, zone: str | None = None) -> str:
+		directory = os.path.join(self.path, 'building=' + quote(str(building), safe=''))
+		if zone is not None:
+			directory = os.path.join(directory, 'zone=' + quote(str(zone), safe=''))
+		return directory
+
+	def _table(self, building: str, zone: str | None = None) -> str:
+		"""Path of the metadata file of a table, which names its data file."""
+		name = self.TOTALS if zone is None else self.TABLE
+		return os.path.join(self._directory(building, zone), f'{name}.json')
+
+	def write(self, building: str, zone: str | None, df: pd.DataFrame) -> None:
+		"""Writes the hourly loads of `zone` of `building` (or the zone totals of
+		the building if `zone` is None), replacing earlier results."""
+		table = self._table(building, zone)
+		directory = os.path.dirname(table)
+		os.makedirs(directory, exist_ok=True)
+		# The loads go to a new data file and the metadata naming it replaces the
+		# old metadata in one step, so a run that stops halfway leaves the
+		# previous table, not a partial one.
+		name, _ = os.path.splitext(os.path.basename(table))
+		meta = {'file': f'{name}.{uuid.uuid4().hex}.{self.format}', 'columns': [str(c) for c in df.columns]}
+		if self.format == 'parquet':
+			df = df.copy(deep=False)
+			df.columns = meta['columns']
+			df.to_parquet(os.path.join(directory, meta['file']))
+		else:
+			meta['index'] = df.index.tolist()
+			np.save(os.path.join(directory, meta['file']), np.ascontiguousarray(df.to_numpy(dtype=float).T))
+		with open(table + '.tmp', 'w', encoding='utf-8') as f:
+			json.dump(meta, f)
+		os.replace(table + '.tmp', table)
+		# data files of earlier (or interrupted) writes
+		for file in os.listdir(directory):
+			if file.startswith(name + '.') and file.endswith('.' + self.format) and file != meta['file']:
+				try:
+					os.remove(os.path.join(directory, file))
+				except OSError: ...		# e.g. still memory-mapped on Windows
+
+	def read(self, building: str, zone: str | None = None, columns: Iterable[str] | None = None) -> pd.DataFrame:
+		"""Hourly loads of `zone` of `building` (or its zone totals if `zone` is
+		None); only `columns` are read if given."""
+		table = self._table(building, zone)
+		if not os.path.exists(table):
+			raise KeyError(f'no results for building {building!r}' + ('' if zone is None else f', zone {zone!r}'))
+		meta = self._meta(table)
+		filepath = os.path.join(os.path.dirname(table), meta['file'])
+		columns = None if columns is None else list(columns)
+		if columns is not None:
+			missing = [c for c in columns if c not in meta['columns']]
+			if missing:
+				raise KeyError(f'{missing} not in the columns of building {building!r}' + ('' if zone is None else f', zone {zone!r}'))
+		if self.format == 'parquet':
+			return pd.read_parquet(filepath, columns=columns)
+		loads = np.load(filepath, mmap_mode='r')
+		rows = range(len(meta['columns'])) if columns is None else [meta['columns'].index(c) for c in columns]
+		return pd.DataFrame({meta['columns'][i]: np.array(loads[i]) for i in rows}, index=meta['index'])
+
+	def columns(self, building: str, zone: str | None = None) -> list[str]:
+		"""Column names of a table without reading its loads."""
+		return self._meta(self._table(building, zone))['columns']
+
+	@staticmethod
+	def _meta(table: str) -> dict:
+		with open(table, encoding='utf-8') as f:
+			return json.load(f)
+
+	def buildings(self) -> list[str]:
+		return [unquote(name) for name in _partitions(self.path, 'building=')]
+
+	def zones(self, building: str | None = None) -> list[tuple[str, str]]:
+		"""(building, zone) of every zone table, of all buildings if `building` is None."""
+		buildings = self.buildings() if building is None else [building]
+		return [(b, unquote(name)) for b in buildings for name in _partitions(self._directory(b), 'zone=')
+				if os.path.exists(self._table(b, unquote(name)))]
+
+	def iter_zones(self, building: str | None = None, columns: Iterable[str] | None = None) -> Iterator[tuple[str, str, pd.DataFrame]]:
+		"""Yields (building, zone, loads) one zone at a time."""
+		columns = None if columns is None else list(columns)
+		for b, z in self.zones(building):
+			yield b, z, self.read(b, z, columns)
+
+	def peaks(self, building: str | None = None, column: str = 'TOTAL_CL') -> pd.DataFrame:
+		"""Peak hour and load of `column` of every zone, indexed by (building,
+		zone), reading only that column."""
+		index, hours, peaks = [], [], []
+		for b, z, df in self.iter_zones(building, [column]):
+			loads = df[column].to_numpy()
+			i = int(loads.argmax())
+			index.append((b, z))
+			hours.append(df.index[i])
+			peaks.append(loads[i])
+		return pd.DataFrame({'Hour': hours, 'Peak (W)': peaks},
+							index=pd.MultiIndex.from_tuples(index, names=['Building', 'Zone']))
+
+	def __repr__(self) -> str:
+		return f'ResultStore({self.path!r}, format={self.format!r})'
+
+def _partitions(directory: str, prefix: str) -> list[str]:
+	if not os.path.isdir(directory):
+		return []
+	return sorted(name[len(prefix):] for name in os.listdir(directory)
+				  if name.startswith(prefix) and os.path.isdir(os.path.join(directory, name)))
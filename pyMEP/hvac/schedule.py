@@ -0,0 +1,140 @@
+from __future__ import annotations
+import weakref
+from datetime import date as Date
+from enum import IntEnum
+from typing import Iterable
+import numpy as np
+
+_profiles: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+def _shared(values: np.ndarray) -> np.ndarray:
+	"""Returns a read-only array equal to `values`; schedules with the same
+	day profiles and timestep share one array."""
+	key = (values.shape, values.tobytes())
+	array = _profiles.get(key)
+	if array is None:
+		array = values.copy()
+		array.flags.writeable = False
+		_profiles[key] = array
+	return array
+
+class Schedule:
+	"""Usage schedule with a day profile for weekdays, weekends and holidays.
+
+	The day profiles are stored as one read-only array with one row per day
+	type and one column per timestep of `timestep` minutes. Schedules with the
+	same profiles share that array, and objects that are given the same
+	`Schedule` follow it by reference when it is updated.
+
+	A `Schedule` is callable with the solar time in seconds from midnight, like
+	the schedule functions of `Equipment`, `Lighting` and `People`, and returns
+	the weekday value at that time (the design day). Evaluating a schedule over
+	a period with `values` or `hourly` indexes the profile array instead of
+	calling the schedule per timestep.
+
+	```
+	office = Schedule([0]*8 + [1]*9 + [0]*7, weekend=[0]*24, holidays=[Date(2024, 12, 25)])
+	office.values(Date(2024, 1, 1), days=7)      # 168 hourly values
+	```
+	"""
+	class DayType(IntEnum):
+		WEEKDAY = 0
+		WEEKEND = 1
+		HOLIDAY = 2
+
+	def __init__(self,
+				 weekday: Iterable[float],
+				 weekend: Iterable[float] | None = None,
+				 holiday: Iterable[float] | None = None,
+				 timestep: int = 60,
+				 holidays: Iterable[Date] = ()):
+		"""
+		Parameters
+		----------
+		weekday:
+			Values of a weekday, one per timestep from midnight. A profile of 24
+			hourly values is also accepted for a sub-hourly timestep.
+		weekend:
+			Values of a Saturday or Sunday; the weekday profile if `None`.
+		holiday:
+			Values of a holiday; the weekend profile if `None`.
+		timestep:
+			Length of a timestep in minutes (e.g. 15 or 60); must divide an hour.
+		holidays:
+			Dates that are evaluated with the holiday profile.
+		"""
+		if timestep <= 0 or 60 % timestep:
+			raise ValueError(f'timestep must divide 60 minutes, got {timestep}')
+		self.timestep = timestep
+		self.holidays = set(holidays)
+		self._days: dict[Schedule.DayType, np.ndarray] = {}
+		self.profiles: np.ndarray
+		self._hourly_profiles: np.ndarray
+		self.update(weekday, weekend, holiday)
+
+	@property
+	def steps_per_hour(self) -> int:
+		return 60 // self.timestep
+
+	@property
+	def steps_per_day(self) -> int:
+		return 24 * self.steps_per_hour
+
+	def update(self,
+			   weekday: Iterable[float] | None = None,
+			   weekend: Iterable[float] | None = None,
+			   holiday: Iterable[float] | None = None) -> None:
+		"""Replaces the given day profiles. A weekend or holiday profile that
+		was never given keeps following its default. Every object that holds
+		this schedule sees the new values."""
+		for day_type, values in zip(self.DayType, (weekday, weekend, holiday)):
+			if values is not None:
+				self._days[day_type] = self._profile(values)
+		weekday = self._days[self.DayType.WEEKDAY]
+		weekend = self._days.get(self.DayType.WEEKEND, weekday)
+		holiday = self._days.get(self.DayType.HOLIDAY, weekend)
+		profiles = np.vstack([weekday, weekend, holiday])
+		self.profiles = _shared(profiles)
+		self._hourly_profiles = _shared(profiles.reshape(3, 24, self.steps_per_hour).mean(axis=2))
+
+	def _profile(self, values: Iterable[float]) -> np.ndarray:
+		values = np.asarray(list(values), dtype=float)
+		if values.size == 24 and self.steps_per_day != 24:
+			values = np.repeat(values, self.steps_per_hour)
+		if values.size != self.steps_per_day:
+			raise ValueError(f'a day profile needs {self.steps_per_day} values for a timestep of {self.timestep} min, got {values.size}')
+		return values
+
+	def __call__(self, t_sol_sec: float) -> float:
+		return float(self.profiles[0, int(t_sol_sec / (60 * self.timestep)) % self.steps_per_day])
+
+	def day(self, day_type: DayType = DayType.WEEKDAY) -> np.ndarray:
+		"""Returns the (read-only) profile of a day type."""
+		return self.profiles[day_type]
+
+	def day_types(self, start: Date, days: int) -> np.ndarray:
+		"""Returns the `DayType` of each of `days` days from date `start`."""
+		ordinals = start.toordinal() + np.arange(days)
+		types = np.where((ordinals - 1) % 7 >= 5, self.DayType.WEEKEND, self.DayType.WEEKDAY)
+		if self.holidays:
+			types[np.isin(ordinals, [d.toordinal() for d in self.holidays])] = self.DayType.HOLIDAY
+		return types
+
+	def values(self, start: Date | None = None, days: int = 1) -> np.ndarray:
+		"""Returns the values at every timestep of `days` days from date
+		`start`. Without `start` the weekday profile is repeated."""
+		if start is None:
+			return np.tile(self.profiles[0], days)
+		return self.profiles[self.day_types(start, days)].ravel()
+
+	def hourly(self, hours: int = 24, start: Date | None = None) -> np.ndarray:
+		"""Returns the mean value of every hour over `hours` hours from
+		midnight of date `start`. Without `start` the weekday profile is
+		repeated (the design day)."""
+		days = -(-hours // 24)
+		if start is None:
+			return np.resize(self._hourly_profiles[0], hours)
+		return self._hourly_profiles[self.day_types(start, days)].ravel()[:hours]
+
+	def __repr__(self) -> str:
+		return f'Schedule(timestep={self.timestep} min, holidays={len(self.holidays)})'
@@ -4,11 +4,13 @@ https://github.com/TomLXXVI/python-hvac
 import numpy as np
 import numpy.typing as npt
 import pytz
+from typing import Callable
 from datetime import time as Time
 from datetime import date as Date
 from datetime import datetime as DateTime
 from datetime import timedelta
 from .. import Quantity
+from .schedule import Schedule
 
 def time_to_decimal_hour(time: Time) -> float:
     """Converts time into decimal hours."""
@@ -240,3 +242,14 @@ def apparent_solar_time(LST: float | np.ndarray, n: float | np.ndarray, LON:Quan
     LSM = 15*TZ
     AST = LST + equation_of_time(n)/60 + (LON.m - LSM)/15
     return AST
+
+def schedule_vector(schedule: Callable[[float], float], hours: int = 24, start: Date | None = None) -> np.ndarray:
+    """Evaluates a schedule function `f(t_sol_sec: float) -> float` at the
+    start of every hour and returns the values as an array of length `hours`.
+    Beyond 24 hours the design day repeats. A `Schedule` object returns its
+    hourly values from midnight of date `start` (with its weekend and holiday
+    profiles) without being called per hour.
+    """
+    if isinstance(schedule, Schedule):
+        return schedule.hourly(hours, start)
+    return np.array([schedule((i % 24) * 3600) for i in range(hours)], dtype=float)
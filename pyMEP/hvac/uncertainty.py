@@ -0,0 +1,80 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass(frozen=True)
+class Distribution:
+	"""Probability distribution of an uncertain input, sampled with a NumPy
+	random `Generator`. `kind` is the name of the `Generator` method and
+	`params` its positional parameters, e.g. `Distribution('normal', (1.0, 0.1))`.
+	Negative samples are clipped to zero.
+	"""
+	kind: str
+	params: tuple[float, ...]
+
+	@classmethod
+	def normal(cls, mean: float, std: float) -> Distribution:
+		return cls('normal', (mean, std))
+
+	@classmethod
+	def uniform(cls, low: float, high: float) -> Distribution:
+		return cls('uniform', (low, high))
+
+	@classmethod
+	def triangular(cls, low: float, mode: float, high: float) -> Distribution:
+		return cls('triangular', (low, mode, high))
+
+	@classmethod
+	def lognormal(cls, mean: float, sigma: float) -> Distribution:
+		"""Log-normal distribution of the underlying normal `mean` and `sigma`."""
+		return cls('lognormal', (mean, sigma))
+
+	@classmethod
+	def fixed(cls, value: float) -> Distribution:
+		return cls('uniform', (value, value))
+
+	def sample(self, rng: np.random.Generator, size: int | tuple[int, ...]) -> np.ndarray:
+		return np.maximum(getattr(rng, self.kind)(*self.params, size=size), 0.0)
+
+@dataclass
+class Uncertainty:
+	"""Uncertain inputs of a zone for a Monte Carlo cooling load calculation
+	(see `zone.monte_carlo_cooling_load`). Every input is a `Distribution`, or
+	`None` to keep the nominal value.
+
+	`U`, `SHGC`, `SC`, `occupancy`, `LPD` and `equipment` are factors on the
+	nominal values of the model: the U-factor of every element and window, the
+	SHGC table and diffuse SHGC of every window, the shading coefficient of
+	every window, and the heat gain of every `PeopleHeatGain`,
+	`LightingHeatGain` and `EquipmentHeatGain`. `infiltration` is the
+	infiltration air flow of the zone in L/s (no infiltration if `None`); it
+	replaces the infiltration of a `VentilationHeatGain`, which must then be
+	zero.
+
+	With `independent` every element, window or heat gain draws its own factor;
+	otherwise one factor per sample applies to all of them (fully correlated,
+	e.g. one construction quality for the whole zone).
+
+	```
+	uncertainty = Uncertainty(U=Distribution.normal(1, 0.1), occupancy=Distribution.triangular(0.5, 1, 1.3))
+	```
+	"""
+	U: Distribution | None = None
+	SHGC: Distribution | None = None
+	SC: Distribution | None = None
+	occupancy: Distribution | None = None
+	LPD: Distribution | None = None
+	equipment: Distribution | None = None
+	infiltration: Distribution | None = None
+	independent: bool = False
+
+	def factors(self, name: str, rng: np.random.Generator, samples: int, count: int) -> np.ndarray:
+		"""Samples of input `name` for `count` objects as an array (samples, count);
+		ones if the input is not uncertain."""
+		distribution = getattr(self, name)
+		if distribution is None:
+			return np.ones((samples, count))
+		if self.independent:
+			return distribution.sample(rng, (samples, count))
+		return np.repeat(distribution.sample(rng, (samples, 1)), count, axis=1)
+
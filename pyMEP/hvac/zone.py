@@ -0,0 +1,713 @@
+import os
+from typing import Iterable, Iterator
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from .. import Quantity
+from .climatic import WeatherData, ReferenceDates
+from .coolingload import Setting, TSMReport, setting_values, RTS, _rts_array, _stack_rts, _time_series_method
+from .external_heat_gains import Building_Element, Roof, Wall, Window, WindowGroup, Floor, irradiance_cache, surface_irradiance, _magnitude
+from .construction import Surface, room_time_series
+from .internal_heat_gains import InternalHeatGain, PeopleHeatGain, LightingHeatGain, EquipmentHeatGain, VentilationHeatGain, outdoor_air_load
+from .uncertainty import Uncertainty
+from .results import ResultStore
+
+Q_ = Quantity
+
+def _repeat_daily(profiles: np.ndarray, hours: int) -> np.ndarray:
+	"""Repeats daily profiles (m, 24) over `hours` hours."""
+	return np.take(profiles, np.arange(hours) % profiles.shape[-1], axis=-1)
+
+def _split_elements(elements: list[Building_Element]) -> tuple[list[Building_Element], list[Building_Element], list[Window]]:
+	"""Exterior roofs and walls, conduction-only elements and the windows of the walls."""
+	external = [e for e in elements if isinstance(e, Roof) or (isinstance(e, Wall) and e.wall_type == Wall.WallType.External)]
+	conduction = [e for e in elements if not any(e is x for x in external)]
+	windows: list[Window] = [w for e in elements if isinstance(e, Wall) for w in e.windows.values()]
+	return external, conduction, windows
+
+def stacked_cooling_load(weather_data: WeatherData,
+						 elements: list[Building_Element],
+						 internal_gains: list[InternalHeatGain] = (),
+						 ns_rts: np.ndarray | pd.DataFrame | None = None,
+						 s_rts: np.ndarray | pd.DataFrame | None = None,
+						 settings: Setting | type[Setting] = Setting) -> pd.DataFrame:
+	"""Cooling load of all building elements and internal heat gains of a zone
+	in one pass (ASHRAE Fundamentals 2021, Chapter 18, RTS method).
+
+	The 24-hour heat input of all exterior surfaces is stacked in one 2-D array
+	(element × hour); the CTS and the NS-RTS/S-RTS are then applied to the whole
+	stack as matrix products and the radiant/convective splits are array
+	operations. The windows of the given walls are included automatically. The
+	results are the same as those of the elements' own `update_cooling_load`,
+	but no per-element DataFrames are built.
+
+	With hourly weather data (`WeatherData.create_from_hourly_data`, e.g. a full
+	year of 8760 hours) the time series are applied as a non-periodic
+	convolution (`annual_time_series`) and the usage schedules of the internal
+	heat gains are evaluated from the start date of the weather data, with
+	their weekday, weekend and holiday profiles (see `Schedule`). Weather data of several design days
+	(`WeatherData.design_day_sweep`) is calculated one periodic day at a time.
+
+	Parameters
+	----------
+	weather_data:
+		Weather data of the zone; `update_sun_position` must have been called.
+	elements:
+		Roofs, ceilings, floors and walls of the zone.
+	internal_gains:
+		Internal heat gains (lighting, people, equipment) of the zone, and the
+		outdoor air load of a `VentilationHeatGain` at every hour of the weather data.
+	ns_rts, s_rts:
+		Zone NS-RTS and S-RTS as returned by `RTS.rts_array` or `RTS.rts_values`.
+		If None, the RTS assigned to each element is used.
+	settings:
+		Indoor temperature, ground reflectance, long-wave corrections and
+		window radiative fractions; a `Setting` object or the class defaults.
+
+	Returns
+	-------
+	DataFrame with the hourly cooling load (W) of each element, window and
+	internal heat gain in a column named after its ID, and the zone total in
+	column 'TOTAL_CL'.
+	"""
+	ids, cooling_load = _stacked_loads(weather_data, elements, internal_gains, ns_rts, s_rts, settings)
+	df = pd.DataFrame(cooling_load[0].T, columns=ids)
+	df['TOTAL_CL'] = cooling_load[0].sum(axis=0)
+	return df
+
+def _stacked_loads(weather_data: WeatherData,
+				   elements: list[Building_Element],
+				   internal_gains: list[InternalHeatGain],
+				   ns_rts: np.ndarray | pd.DataFrame | None,
+				   s_rts: np.ndarray | pd.DataFrame | None,
+				   settings: Setting | type[Setting],
+				   rotations: np.ndarray | None = None) -> tuple[list[str], np.ndarray]:
+	"""IDs and hourly cooling loads (rotation × ID × hour) of `stacked_cooling_load`.
+	Without `rotations` there is one rotation (the building as is); otherwise
+	the surface azimuths are turned by every rotation (degrees) and the
+	solar-dependent loads are calculated for all rotations as one stack."""
+	_check_tsm_export(settings)
+	T_out = weather_data.T_db_array
+	time_series = _time_series_method(weather_data)
+	R = 1 if rotations is None else len(rotations)
+	N = T_out.size
+	T_in = settings.Inside_DB.m
+	external, conduction, windows = _split_elements(elements)
+	ids, loads = [], []
+
+	# Exterior roofs and walls: sol-air heat input -> CTS -> radiant part delayed by NS-RTS
+	if external:
+		irradiance = _sweep_irradiance(weather_data, [e.psi.m for e in external], [e.sigma.m for e in external], settings.rho, rotations)
+		alpha = _tile_rows(np.array([[e.surface_absorptance] for e in external]), R)
+		lwc = _tile_rows(np.array([[settings.hlwc if isinstance(e, Roof) else settings.vlwc] for e in external]), R)
+		UA = _tile_rows(np.array([[_magnitude(e.U * e.net_area)] for e in external]), R)
+		F_rad = _tile_rows(np.array([[e.F_rad] for e in external]), R)
+		T_e = T_out + alpha * irradiance['Et(W/m2)'] - lwc
+		q_i = UA * (T_e - T_in)
+		hg = time_series(_tile_rows(np.vstack([e.CTS for e in external]), R), q_i)
+		rts_cl = time_series(_tile_rows(_stack_rts(ns_rts, (e.NS_RTS for e in external), 'NS-RTS'), R), F_rad * hg)
+		ids += [e.ID for e in external]
+		loads.append(((1 - F_rad) * hg + rts_cl).reshape(R, len(external), N))
+
+	# Ceilings, floors and interior walls: steady conduction from the adjacent space
+	if conduction:
+		q = np.array([[_magnitude(e.U * e.net_area) * e.delta_T.to('delta_degC').m] for e in conduction])
+		ids += [e.ID for e in conduction]
+		loads.append(np.broadcast_to(q, (R, len(conduction), N)))
+
+	# Windows: beam gain delayed by S-RTS, diffuse and conduction gain split and delayed by NS-RTS
+	if windows:
+		irradiance = _sweep_irradiance(weather_data, [w.host.psi.m for w in windows], [w.host.sigma.m for w in windows], settings.rho, rotations)
+		ids += [w.ID for w in windows]
+		group = WindowGroup(windows)
+		altitude = weather_data.position_df['Altitude'].to_numpy()
+		loads.append(group.loads(irradiance, T_out, ns_rts, s_rts, settings, time_series, altitude=altitude).reshape(R, len(windows), N))
+
+	# Internal heat gains: radiant part delayed by NS-RTS, the rest is immediate
+	if internal_gains:
+		rows = np.empty((len(internal_gains), N))
+		start = weather_data.schedule_start
+		index = [i for i, ig in enumerate(internal_gains) if not isinstance(ig, VentilationHeatGain)]
+		if index:
+			if start is None:
+				gains = [internal_gains[i].radiant_convective() for i in index]
+				radiant = _repeat_daily(np.vstack([g[0] for g in gains]), N)
+				immediate = _repeat_daily(np.vstack([g[1] for g in gains]), N)
+			else:
+				gains = [internal_gains[i].radiant_convective(N, start) for i in index]
+				radiant = np.vstack([g[0] for g in gains])
+				immediate = np.vstack([g[1] for g in gains])
+			rts_cl = time_series(_stack_rts(ns_rts, (internal_gains[i].cooling_load_df['NS-RTS'].tolist() for i in index), 'NS-RTS'), radiant)
+			rows[index] = immediate + rts_cl
+		# Ventilation and infiltration: outdoor air load at every hour of the weather data, immediate
+		index = [i for i, ig in enumerate(internal_gains) if isinstance(ig, VentilationHeatGain)]
+		if index:
+			sensible, latent = outdoor_air_load(weather_data, settings)
+			rows[index] = np.vstack([internal_gains[i].airflow(N, start) for i in index]) * (sensible + latent)
+		ids += [ig.ID for ig in internal_gains]
+		loads.append(np.broadcast_to(rows, (R, len(internal_gains), N)))
+
+	cooling_load = np.concatenate(loads, axis=1) if loads else np.zeros((R, 0, N))
+	return ids, cooling_load
+
+def _tile_rows(a: np.ndarray, R: int) -> np.ndarray:
+	"""Per-element rows (m, ...) repeated for R rotations (R × m, ...); a 1-D
+	time series shared by all elements is returned as is."""
+	return a if R == 1 or a.ndim == 1 else np.tile(a, (R,) + (1,) * (a.ndim - 1))
+
+def _sweep_irradiance(weather_data: WeatherData, psi: list[float], sigma: list[float], rho: float,
+					  rotations: np.ndarray | None) -> dict[str, np.ndarray]:
+	"""Irradiance of m surfaces as (m, hours) arrays, or for R rotations as
+	(R × m, hours) arrays. The rotated profiles are one broadcast
+	(rotation × orientation × hour) evaluation of `surface_irradiance` over the
+	distinct orientations, on the sun positions already in the weather data."""
+	if rotations is None:
+		return irradiance_cache.stack(weather_data, psi, sigma, rho)
+	keys = [(float(p), float(s)) for p, s in zip(psi, sigma)]
+	unique = {k: i for i, k in enumerate(dict.fromkeys(keys))}
+	psi_u = np.array([k[0] for k in unique])
+	sigma_u = np.array([k[1] for k in unique])
+	irradiance = surface_irradiance(weather_data.position_df, psi_u[None, :] + np.asarray(rotations, dtype=float)[:, None], sigma_u[None, :], rho)
+	index = [unique[k] for k in keys]
+	return {c: v[:, index].reshape(-1, v.shape[-1]) for c, v in irradiance.items()}
+
+def orientation_sweep(weather_data: WeatherData,
+					  elements: list[Building_Element],
+					  internal_gains: list[InternalHeatGain] = (),
+					  ns_rts: np.ndarray | pd.DataFrame | None = None,
+					  s_rts: np.ndarray | pd.DataFrame | None = None,
+					  rotations: Iterable[float] = range(0, 360, 15),
+					  settings: Setting | type[Setting] = Setting) -> tuple[pd.DataFrame, pd.DataFrame]:
+	"""Peak cooling load of a zone for every rotation of the building, in
+	degrees clockwise in plan (added to the surface azimuth of every roof, wall
+	and window). The sun positions of `weather_data` are calculated once and
+	the irradiance of all rotations is one broadcast array; see
+	`stacked_cooling_load` for the other parameters.
+
+	Returns
+	-------
+	- DataFrame indexed by rotation with the columns 'Hour' and 'Peak (W)' of
+	  the zone total.
+	- DataFrame with the hourly zone total (one column per rotation).
+	"""
+	rotations = np.asarray(list(rotations), dtype=float)
+	_, cooling_load = _stacked_loads(weather_data, elements, internal_gains, ns_rts, s_rts, settings, rotations)
+	df = pd.DataFrame(cooling_load.sum(axis=1).T, columns=pd.Index(rotations, name='Rotation (deg)'))
+	return _rotation_peaks(df), df
+
+def _rotation_peaks(df: pd.DataFrame) -> pd.DataFrame:
+	loads = df.to_numpy()
+	i = loads.argmax(axis=0)
+	return pd.DataFrame({'Hour': i, 'Peak (W)': loads[i, np.arange(loads.shape[1])]}, index=df.columns)
+
+def monte_carlo_cooling_load(weather_data: WeatherData,
+							 elements: list[Building_Element],
+							 internal_gains: list[InternalHeatGain] = (),
+							 uncertainty: Uncertainty | None = None,
+							 samples: int = 1000,
+							 percentiles: Iterable[float] = (10, 50, 90),
+							 ns_rts: np.ndarray | pd.DataFrame | None = None,
+							 s_rts: np.ndarray | pd.DataFrame | None = None,
+							 settings: Setting | type[Setting] = Setting,
+							 seed: int | None = None) -> tuple[pd.Series, pd.DataFrame]:
+	"""Monte Carlo cooling load of a zone: `samples` sets of the uncertain inputs
+	(see `Uncertainty`) are drawn and evaluated as arrays in one pass, without
+	copies of the elements. The loads of roofs, walls, ceilings, floors and
+	internal heat gains are linear in their factors, so the nominal loads are
+	calculated once and combined per sample as (samples × objects) @ (objects ×
+	hours). Windows are evaluated for all samples as one (samples × windows,
+	hours) stack, because the radiant fraction depends on the sampled SHGC.
+	Infiltration adds the sensible and latent load of outdoor air, 1.23·Q·Δt
+	and 3010·Q·ΔW in W with Q in L/s (ASHRAE Fundamentals 2021 Chapter 16,
+	standard air). An uncertain infiltration is the whole infiltration of the
+	zone, so a `VentilationHeatGain` in `internal_gains` must then have no
+	infiltration of its own (a ValueError is raised otherwise); its ventilation
+	airflow stays nominal. See `stacked_cooling_load` for the other parameters.
+
+	Returns
+	-------
+	- Series with the percentiles of the peak zone load of the samples,
+	  indexed 'P10', 'P50', 'P90', ...
+	- DataFrame with the percentiles of the zone load at every hour (one column
+	  per percentile).
+	"""
+	rng = np.random.default_rng(seed)
+	uncertainty = uncertainty if uncertainty is not None else Uncertainty()
+	internal_gains = list(internal_gains)
+	if uncertainty.infiltration is not None:
+		infiltrating = [ig.ID for ig in internal_gains if isinstance(ig, VentilationHeatGain) and ig.infiltration.to('L / s').m != 0]
+		if infiltrating:
+			raise ValueError(f'the uncertain infiltration would be added to the infiltration of {infiltrating}; '
+							 'set their infiltration to zero or leave Uncertainty.infiltration None')
+	external, conduction, windows = _split_elements(elements)
+	opaque = external + conduction
+	T_out = weather_data.T_db_array
+
+	U = uncertainty.factors('U', rng, samples, len(opaque) + len(windows))
+	gain_factors = np.ones((samples, len(internal_gains)))
+	for cls, name in ((PeopleHeatGain, 'occupancy'), (LightingHeatGain, 'LPD'), (EquipmentHeatGain, 'equipment')):
+		index = [i for i, ig in enumerate(internal_gains) if isinstance(ig, cls)]
+		if index:
+			gain_factors[:, index] = uncertainty.factors(name, rng, samples, len(index))
+	_, nominal = _stacked_loads(weather_data, elements, internal_gains, ns_rts, s_rts, settings)
+	nominal = np.delete(nominal[0], np.s_[len(opaque):len(opaque) + len(windows)], axis=0)
+	total = np.hstack([U[:, :len(opaque)], gain_factors]) @ nominal
+
+	if windows:
+		irradiance = irradiance_cache.stack(weather_data, [w.host.psi.m for w in windows], [w.host.sigma.m for w in windows], settings.rho)
+		irradiance = {c: np.tile(irradiance[c], (samples, 1)) for c in ('γ-gamma', 'Incidence', 'Etb(W/m2)', 'Etd(W/m2)', 'Etr(W/m2)')}
+		loads = WindowGroup(windows).loads(irradiance, T_out, ns_rts, s_rts, settings, _time_series_method(weather_data),
+										   U=U[:, len(opaque):].reshape(-1, 1),
+										   SHGC=uncertainty.factors('SHGC', rng, samples, len(windows)).reshape(-1, 1),
+										   SC=uncertainty.factors('SC', rng, samples, len(windows)).reshape(-1, 1),
+										   altitude=weather_data.position_df['Altitude'].to_numpy())
+		total += loads.reshape(samples, len(windows), -1).sum(axis=1)
+
+	if uncertainty.infiltration is not None:
+		sensible, latent = outdoor_air_load(weather_data, settings)
+		total += uncertainty.infiltration.sample(rng, (samples, 1)) * (sensible + latent)
+
+	percentiles = list(percentiles)
+	columns = [f'P{p:g}' for p in percentiles]
+	peaks = pd.Series(np.percentile(total.max(axis=1), percentiles), index=columns, name='Peak (W)')
+	return peaks, pd.DataFrame(np.percentile(total, percentiles, axis=0).T, columns=columns)
+
+def peak_month_search(weather_data: WeatherData,
+					  elements: list[Building_Element],
+					  internal_gains: list[InternalHeatGain] = (),
+					  ns_rts: np.ndarray | pd.DataFrame | None = None,
+					  s_rts: np.ndarray | pd.DataFrame | None = None,
+					  months: Iterable[str | int] | None = None,
+					  T_db_des: Iterable[Quantity] | None = None,
+					  settings: Setting | type[Setting] = Setting) -> tuple[pd.DataFrame, pd.DataFrame]:
+	"""Searches the peak month and hour of every element, window, internal heat
+	gain and of the zone total over the monthly design days of `ReferenceDates`.
+	All months are calculated in one pass, see `WeatherData.design_day_sweep`
+	(`months` and `T_db_des`) and `stacked_cooling_load` (other parameters).
+
+	Returns
+	-------
+	- DataFrame indexed by ID (and 'TOTAL_CL') with the columns 'Month', 'Hour'
+	  and 'Peak (W)'.
+	- DataFrame with the hourly cooling loads of all months back to back, see
+	  `stacked_cooling_load`.
+	"""
+	months = list(ReferenceDates.months()) if months is None else list(months)
+	sweep = weather_data.design_day_sweep(months, T_db_des)
+	sweep.update_sun_position()
+	df = stacked_cooling_load(sweep, elements, internal_gains, ns_rts=ns_rts, s_rts=s_rts, settings=settings)
+	return _monthly_peaks(df, months), df
+
+def _monthly_peaks(df: pd.DataFrame, months: list) -> pd.DataFrame:
+	loads = df.to_numpy()
+	i = loads.argmax(axis=0)
+	return pd.DataFrame({'Month': np.array(months, dtype=object)[i // 24],
+						 'Hour': i % 24,
+						 'Peak (W)': loads[i, np.arange(loads.shape[1])]}, index=df.columns)
+
+class Zone:
+	"""A thermal zone: the building elements and internal heat gains that share
+	one room air node, one RTS selection and one weather data set.
+
+	```
+	zone = Zone('Room 1', weather_data=wd, room_construction='Medium', carpet='With Carpet')
+	zone.add_element(roof)
+	zone.add_element(wall_a)				# windows of the wall are included
+	zone.add_internal_gain(lighting)
+	zone.update_cooling_load()
+	zone.peak_hour, zone.peak_load
+	```
+
+	`update_cooling_load` only recalculates what changed since the previous call:
+	the sun position when the date or location of the weather data changed, and
+	the elements (with their windows) and internal heat gains whose inputs
+	changed. Edits of the lighting, equipment or people objects inside an
+	internal heat gain are not tracked; call `invalidate` for them.
+
+	The loads are calculated as one stack, without `TimeSeriesMethod`, so the
+	settings of a zone must have `tsm_export` off (ValueError otherwise).
+	"""
+	def __init__(self, ID: str,
+				 weather_data: WeatherData,
+				 room_construction: str = Setting.NRTS_Room_construction,
+				 carpet: str = Setting.NRTS_Carpet,
+				 glass: str = Setting.NRTS_Glass,
+				 settings: Setting | None = None) -> None:
+		self.ID = ID
+		self._settings = settings if settings is not None else Setting
+		self.weather_data = weather_data
+		self.room_construction = room_construction
+		self.carpet = carpet
+		self.glass = glass
+		self.elements: dict[str, Building_Element] = {}
+		self.internal_gains: dict[str, InternalHeatGain] = {}
+		# RTS from the zone's own surfaces instead of the tables, see `use_room_rts`
+		self.room_rts = False
+		self.extra_surfaces: list[Surface] = []
+		self.cooling_load_df: pd.DataFrame | None = None
+		self.monthly_cooling_load_df: pd.DataFrame | None = None
+		self.orientation_cooling_load_df: pd.DataFrame | None = None
+		self.monte_carlo_cooling_load_df: pd.DataFrame | None = None
+		# incremental recalculation: ID -> (input key, column IDs, loads)
+		self._nodes: dict[str, tuple[tuple, list[str], np.ndarray]] = {}
+		self._context: tuple | None = None
+
+	def add_element(self, element: Building_Element) -> Building_Element:
+		"""Adds a roof, ceiling, floor or wall; windows come with their host wall.
+		The element and its windows take the weather data and settings of the zone."""
+		element.weather_data = self.weather_data
+		_assign_settings(element, self.settings)
+		self.elements[element.ID] = element
+		return element
+
+	def remove_element(self, ID: str):
+		self.elements.pop(ID)
+
+	def add_internal_gain(self, internal_gain: InternalHeatGain) -> InternalHeatGain:
+		"""Adds a `LightingHeatGain`, `PeopleHeatGain`, `EquipmentHeatGain` or
+		`VentilationHeatGain`. The heat gain takes the settings of the zone; a
+		ventilation heat gain also its weather data."""
+		internal_gain.settings = self.settings
+		if isinstance(internal_gain, VentilationHeatGain):
+			internal_gain.weather_data = self.weather_data
+		self.internal_gains[internal_gain.ID] = internal_gain
+		return internal_gain
+
+	def remove_internal_gain(self, ID: str):
+		self.internal_gains.pop(ID)
+
+	@property
+	def settings(self) -> Setting | type[Setting]:
+		"""Settings of the zone (indoor temperature etc.), the `Setting` class
+		defaults unless a `Setting` object is given; shared with its elements
+		and internal heat gains."""
+		return self._settings
+	@settings.setter
+	def settings(self, settings: Setting | type[Setting]) -> None:
+		self._settings = settings
+		for element in self.elements.values():
+			_assign_settings(element, settings)
+		for internal_gain in self.internal_gains.values():
+			internal_gain.settings = settings
+
+	@property
+	def zone_type(self) -> str:
+		"""'Exterior' if the zone has a roof or an external wall, else 'Interior'."""
+		exterior = any(isinstance(e, Roof) or (isinstance(e, Wall) and e.wall_type == Wall.WallType.External) for e in self.elements.values())
+		return 'Exterior' if exterior else 'Interior'
+
+	@property
+	def ns_rts(self) -> np.ndarray:
+		"""Zone NS-RTS (read-only view of `RTS.rts_array`, or of the room RTS)."""
+		if self.room_rts:
+			return room_time_series(self.room_surfaces())[0]
+		return RTS.rts_array(nrts=True, zones=self.zone_type, room_construction=self.room_construction, carpet=self.carpet, glass=self.glass)
+
+	@property
+	def s_rts(self) -> np.ndarray:
+		"""Zone S-RTS (read-only view of `RTS.rts_array`, or of the room RTS)."""
+		if self.room_rts:
+			return room_time_series(self.room_surfaces())[1]
+		return RTS.rts_array(nrts=False, room_construction=self.room_construction, carpet=self.carpet, glass=self.glass)
+
+	def use_room_rts(self, extra_surfaces: Iterable[Surface] = ()) -> None:
+		"""Uses RTS computed from the zone's own surfaces (see
+		`construction.room_time_series`) instead of the ASHRAE tables: every
+		element with a construction (see `Building_Element.set_construction`),
+		the windows of the walls and `extra_surfaces`, e.g. a floor, ceiling,
+		partitions or furniture that have no element of their own."""
+		self.room_rts = True
+		self.extra_surfaces = list(extra_surfaces)
+
+	def room_surfaces(self) -> list[Surface]:
+		"""Room surfaces for the room RTS; elements without a construction are
+		left out."""
+		surfaces = []
+		for e in self.elements.values():
+			if e.construction is not None:
+				exterior = isinstance(e, Roof) or (isinstance(e, Wall) and e.wall_type == Wall.WallType.External)
+				surfaces.append(Surface(e.construction, e.net_area, exterior=exterior, floor=isinstance(e, Floor)))
+			for w in getattr(e, 'windows', {}).values():
+				U = w.U if isinstance(w.U, Quantity) else Q_(w.U, 'W / (m ** 2 * K)')
+				surfaces.append(Surface.glazing(U, w.net_area))
+		return surfaces + self.extra_surfaces
+
+	def invalidate(self, ID: str | None = None) -> None:
+		"""Recalculate element or internal heat gain `ID` (everything if None) on the
+		next `update_cooling_load`."""
+		if ID is None:
+			self._nodes.clear()
+		else:
+			self._nodes.pop(ID, None)
+
+	def update_cooling_load(self) -> pd.DataFrame:
+		"""Calculates the hourly cooling load of every element and internal heat gain
+		and the zone total, see `stacked_cooling_load`. Results of unchanged
+		elements and internal heat gains are reused."""
+		if self.weather_data.sun_position_outdated:
+			self.weather_data.update_sun_position()
+		ns_rts, s_rts = self.ns_rts, self.s_rts
+		context = _context_key(self.weather_data, ns_rts, s_rts, self.settings)
+		if self._context is None or context[0] is not self._context[0] or context[1:] != self._context[1:]:
+			self._nodes.clear()
+			self._context = context
+		nodes = {**{e.ID: (e, _element_key(e)) for e in self.elements.values()},
+				 **{ig.ID: (ig, _internal_gain_key(ig)) for ig in self.internal_gains.values()}}
+		stale = [(ID, obj, key) for ID, (obj, key) in nodes.items() if ID not in self._nodes or self._nodes[ID][0] != key]
+		if stale:
+			df = stacked_cooling_load(self.weather_data,
+									  [obj for _, obj, _ in stale if isinstance(obj, Building_Element)],
+									  [obj for _, obj, _ in stale if isinstance(obj, InternalHeatGain)],
+									  ns_rts=ns_rts,
+									  s_rts=s_rts,
+									  settings=self.settings)
+			for ID, obj, key in stale:
+				columns = [ID] + [w.ID for w in getattr(obj, 'windows', {}).values()]
+				self._nodes[ID] = (key, columns, df[columns].to_numpy().T)
+		for ID in set(self._nodes) - set(nodes):
+			self._nodes.pop(ID)
+		loads = {c: v for _, columns, values in self._nodes.values() for c, v in zip(columns, values)}
+		external, conduction, windows = _split_elements(list(self.elements.values()))
+		order = [x.ID for x in (*external, *conduction, *windows, *self.internal_gains.values())]
+		self.cooling_load_df = pd.DataFrame({ID: loads[ID] for ID in order})
+		self.cooling_load_df['TOTAL_CL'] = self.cooling_load_df.sum(axis=1)
+		return self.cooling_load_df
+
+	def peak_month_search(self, months: Iterable[str | int] | None = None,
+						  T_db_des: Iterable[Quantity] | None = None) -> pd.DataFrame:
+		"""Peak month, hour and load of every element and internal heat gain and of
+		the zone ('TOTAL_CL') over the monthly design days, see `peak_month_search`.
+		The hourly loads of all months are kept in `monthly_cooling_load_df`."""
+		peaks, self.monthly_cooling_load_df = peak_month_search(self.weather_data,
+																list(self.elements.values()),
+																list(self.internal_gains.values()),
+																ns_rts=self.ns_rts,
+																s_rts=self.s_rts,
+																months=months,
+																T_db_des=T_db_des,
+																settings=self.settings)
+		return peaks
+
+	def orientation_sweep(self, rotations: Iterable[float] = range(0, 360, 15)) -> pd.DataFrame:
+		"""Peak hour and load of the zone for every rotation of the building in
+		degrees, see `orientation_sweep`. The hourly zone totals are kept in
+		`orientation_cooling_load_df` (one column per rotation)."""
+		if self.weather_data.sun_position_outdated:
+			self.weather_data.update_sun_position()
+		peaks, self.orientation_cooling_load_df = orientation_sweep(self.weather_data,
+																	list(self.elements.values()),
+																	list(self.internal_gains.values()),
+																	ns_rts=self.ns_rts,
+																	s_rts=self.s_rts,
+																	rotations=rotations,
+																	settings=self.settings)
+		return peaks
+
+	def monte_carlo(self, uncertainty: Uncertainty,
+					samples: int = 1000,
+					percentiles: Iterable[float] = (10, 50, 90),
+					seed: int | None = None) -> pd.Series:
+		"""Percentiles of the peak zone load over `samples` draws of the uncertain
+		inputs, see `monte_carlo_cooling_load`. The hourly load percentiles are
+		kept in `monte_carlo_cooling_load_df`."""
+		if self.weather_data.sun_position_outdated:
+			self.weather_data.update_sun_position()
+		peaks, self.monte_carlo_cooling_load_df = monte_carlo_cooling_load(self.weather_data,
+																		   list(self.elements.values()),
+																		   list(self.internal_gains.values()),
+																		   uncertainty=uncertainty,
+																		   samples=samples,
+																		   percentiles=percentiles,
+																		   ns_rts=self.ns_rts,
+																		   s_rts=self.s_rts,
+																		   settings=self.settings,
+																		   seed=seed)
+		return peaks
+
+	@property
+	def peak_hour(self) -> int:
+		return int(self.cooling_load_df['TOTAL_CL'].idxmax())
+
+	@property
+	def peak_load(self) -> Quantity:
+		return Q_(self.cooling_load_df['TOTAL_CL'].max(), 'W')
+
+class Building:
+	"""A collection of zones whose cooling loads are evaluated concurrently.
+
+	Zones are sent to worker processes, so everything they hold must be
+	picklable (e.g. schedules must be `Schedule` objects, module-level functions
+	or bound methods, not lambdas). The current `Setting` class values are
+	passed to the workers; zones with their own `Setting` object (e.g. other
+	indoor setpoints) carry it along.
+	"""
+	def __init__(self, ID: str) -> None:
+		self.ID = ID
+		self.zones: dict[str, Zone] = {}
+		self.cooling_load_df: pd.DataFrame | None = None
+
+	def add_zone(self, zone: Zone) -> Zone:
+		self.zones[zone.ID] = zone
+		return zone
+
+	def remove_zone(self, ID: str):
+		self.zones.pop(ID)
+
+	def get_zone(self, ID: str) -> Zone:
+		return self.zones[ID]
+
+	def update_cooling_load(self, max_workers: int | None = None, min_parallel: int = 8,
+							store: ResultStore | None = None) -> pd.DataFrame:
+		"""Calculates all zones and returns the hourly load of each zone (column
+		named after the zone ID) and the building block load in 'TOTAL_CL'.
+
+		Parameters
+		----------
+		max_workers:
+			Number of worker processes; `None` uses the number of processors and
+			1 calculates the zones in the calling process.
+		min_parallel:
+			Below this number of zones the calculation stays in the calling process.
+		store:
+			`ResultStore` that the loads of every zone are written to as soon as
+			the zone is done, and the returned zone totals at the end. The zones
+			then do not keep their `cooling_load_df`; read it from the store.
+		"""
+		zones = list(self.zones.values())
+		for zone in zones:
+			_check_tsm_export(zone.settings)
+			if zone.weather_data.position_df is None:
+				zone.weather_data.update_sun_position()
+		totals = {}
+		for zone, df in zip(zones, _iter_zones(_zone_cooling_load, zones, max_workers, min_parallel)):
+			totals[zone.ID] = df['TOTAL_CL'].to_numpy()
+			if store is None:
+				zone.cooling_load_df = df
+			else:
+				store.write(self.ID, zone.ID, df)
+				zone.cooling_load_df = None
+		self.cooling_load_df = pd.DataFrame(totals)
+		self.cooling_load_df['TOTAL_CL'] = self.cooling_load_df.sum(axis=1)
+		if store is not None:
+			store.write(self.ID, None, self.cooling_load_df)
+		return self.cooling_load_df
+
+	def peak_month_search(self, months: Iterable[str | int] | None = None,
+						  max_workers: int | None = None,
+						  min_parallel: int = 8) -> pd.DataFrame:
+		"""Peak month, hour and load of every zone and of the building block load
+		('TOTAL_CL') over the monthly design days. The peaks of the elements of
+		each zone are in `Zone.peak_month_search`'s result, the hourly loads in
+		`Zone.monthly_cooling_load_df`. See `update_cooling_load` for the parameters.
+		"""
+		months = list(ReferenceDates.months()) if months is None else list(months)
+		zones = list(self.zones.values())
+		for zone in zones:
+			_check_tsm_export(zone.settings)
+		results = _map_zones(_zone_monthly_cooling_load, [(zone, months) for zone in zones], max_workers, min_parallel)
+		for zone, df in zip(zones, results):
+			zone.monthly_cooling_load_df = df
+		df = pd.DataFrame({zone.ID: df['TOTAL_CL'] for zone, df in zip(zones, results)})
+		df['TOTAL_CL'] = df.sum(axis=1)
+		return _monthly_peaks(df, months)
+
+	def orientation_sweep(self, rotations: Iterable[float] = range(0, 360, 15),
+						  max_workers: int | None = None,
+						  min_parallel: int = 8) -> pd.DataFrame:
+		"""Peak hour and block load of the building for every rotation in
+		degrees; all zones turn together. The hourly zone totals of each zone are
+		in `Zone.orientation_cooling_load_df`. See `update_cooling_load` for the
+		parameters."""
+		rotations = list(rotations)
+		zones = list(self.zones.values())
+		for zone in zones:
+			_check_tsm_export(zone.settings)
+			if zone.weather_data.sun_position_outdated:
+				zone.weather_data.update_sun_position()
+		results = _map_zones(_zone_orientation_cooling_load, [(zone, rotations) for zone in zones], max_workers, min_parallel)
+		for zone, df in zip(zones, results):
+			zone.orientation_cooling_load_df = df
+		return _rotation_peaks(sum(results))
+
+	@property
+	def peak_hour(self) -> int:
+		return int(self.cooling_load_df['TOTAL_CL'].idxmax())
+
+	@property
+	def peak_load(self) -> Quantity:
+		return Q_(self.cooling_load_df['TOTAL_CL'].max(), 'W')
+
+def _map_zones(func, items: list, max_workers: int | None, min_parallel: int) -> list:
+	"""`func` applied to every item, in worker processes when there are enough items."""
+	return list(_iter_zones(func, items, max_workers, min_parallel))
+
+def _iter_zones(func, items: list, max_workers: int | None, min_parallel: int) -> Iterator:
+	"""Like `_map_zones`, but yields each result (in order) as soon as it is done."""
+	if max_workers == 1 or len(items) < min_parallel:
+		yield from map(func, items)
+		return
+	workers = max_workers or os.cpu_count() or 1
+	with ProcessPoolExecutor(max_workers=workers, initializer=_apply_setting, initargs=(_setting_snapshot(), (RTS._arrays, RTS._rows))) as executor:
+		yield from executor.map(func, items, chunksize=max(1, len(items) // (4 * workers)))
+
+def _check_tsm_export(settings: Setting | type[Setting]) -> None:
+	"""Zones and buildings calculate the loads of all elements as one stack, not
+	with `TimeSeriesMethod`, so they have no diagnostic tables to export (and a
+	`TSMReport` cannot be sent to the worker processes of a `Building`)."""
+	if isinstance(settings.tsm_export, TSMReport) or settings.tsm_export:		# an empty report is falsy
+		raise ValueError('tsm_export is not supported by zone and building calculations; '
+						 'turn it off in their settings and call update_cooling_load of the '
+						 'elements or internal heat gains to export their tables')
+
+def _assign_settings(element: Building_Element, settings: Setting | type[Setting]) -> None:
+	element.settings = settings
+	for window in getattr(element, 'windows', {}).values():
+		window.settings = settings
+
+def _context_key(weather_data: WeatherData, ns_rts: np.ndarray, s_rts: np.ndarray, settings: Setting | type[Setting]) -> tuple:
+	"""Inputs shared by all elements of a zone: sun position, outdoor temperatures,
+	zone RTS and the settings. The sun position (`position_df`, replaced by every
+	`update_sun_position`) comes first and is compared by identity."""
+	return (weather_data.position_df, weather_data.T_db_array.tobytes(),
+			_rts_array(ns_rts, 'NS-RTS').tobytes(), _rts_array(s_rts, 'S-RTS').tobytes(),
+			tuple((k, repr(v)) for k, v in sorted(setting_values(settings).items())))
+
+def _element_key(e: Building_Element) -> tuple:
+	"""Inputs of an element (and its windows) that its cooling load depends on."""
+	windows = tuple((w.ID, _magnitude(w.U * w.net_area), _magnitude(w.net_area), w.SC, w.SHGCh, tuple(w.SHGCd),
+					 _magnitude(w.Width), _magnitude(w.Height), w.shading.dimensions() if w.shading is not None else None)
+					for w in getattr(e, 'windows', {}).values())
+	return (type(e), getattr(e, 'wall_type', None), e.psi.m, getattr(e, 'sigma', Q_(0, 'deg')).m,
+			_magnitude(e.U * e.net_area), tuple(e.CTS), getattr(e, 'F_rad', None), e.surface_absorptance,
+			e.delta_T.to('delta_degC').m, windows)
+
+def _internal_gain_key(ig: InternalHeatGain) -> tuple:
+	"""Tracked inputs of an internal heat gain (the objects inside it are not):
+	every day-type profile and the holidays of its usage schedule."""
+	schedule = (ig.schedule.timestep, ig.schedule.profiles.tobytes(), tuple(sorted(ig.schedule.holidays)))
+	if isinstance(ig, VentilationHeatGain):
+		return (type(ig), schedule, ig.outdoor_airflow.m, ig.infiltration.to('L / s').m)
+	return (type(ig), schedule)
+
+def _zone_cooling_load(zone: Zone) -> pd.DataFrame:
+	return zone.update_cooling_load()
+
+def _zone_monthly_cooling_load(args: tuple[Zone, list]) -> pd.DataFrame:
+	zone, months = args
+	zone.peak_month_search(months)
+	return zone.monthly_cooling_load_df
+
+def _zone_orientation_cooling_load(args: tuple[Zone, list]) -> pd.DataFrame:
+	zone, rotations = args
+	zone.orientation_sweep(rotations)
+	return zone.orientation_cooling_load_df
+
+def _setting_snapshot() -> dict:
+	return setting_values(Setting)
+
+def _apply_setting(snapshot: dict, rts: tuple[dict, dict] | None = None) -> None:
+	for k, v in snapshot.items():
+		setattr(Setting, k, v)
+	if rts is not None:
+		# RTS tables including the ones registered in the parent process
+		RTS._arrays, RTS._rows = rts
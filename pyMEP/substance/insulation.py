@@ -1,5 +1,7 @@
 import numpy as np
 from enum import Enum
+from contextlib import contextmanager
+from functools import lru_cache
 from CoolProp.HumidAirProp import HAPropsSI
 from scipy.optimize import fsolve
 from scipy.constants import Stefan_Boltzmann
@@ -8,11 +10,28 @@ import pyMEP.HeatTransfer.NaturalConvection.ExternalFlow.horizontal_cylinder as
 import pyMEP.HeatTransfer.NaturalConvection.ExternalFlow.vertical_cylinder as vCylinder
 import pyMEP.HeatTransfer.NaturalConvection.ExternalFlow.vertical_plate as vPlate
 import pyMEP.HeatTransfer.NaturalConvection.ExternalFlow.horizontal_plate as hPlate
+import pyMEP.HeatTransfer.NaturalConvection.ExternalFlow.sphere as sSphere
 from ..substance import Fluid, FluidState, INSULATION
 from pyMEP import Quantity
 
 Q_ = Quantity
 
+@lru_cache(maxsize=1024)
+def _air_state(t_amb: float, rh: float, pressure: float) -> tuple[float, FluidState]:
+	"""Returns the dew point (K) and the air properties at film temperature for
+	an ambient temperature `t_amb` (K) and relative humidity `rh` (fraction).
+	Results are shared between `Insulation` objects and must be treated as read-only."""
+	dew_point = HAPropsSI('D','T',t_amb,'P',pressure,'R',rh)
+	t_flm = (t_amb + dew_point) / 2
+	air = Insulation._Air(T=Q_(t_flm, 'degK'), P=Q_(pressure, 'Pa'))
+	return dew_point, air
+
+def _sphere_heat_trf_coeff(sphere: sSphere.Sphere) -> Quantity:
+	"""Average heat transfer coefficient of a `Sphere` whose diameter `D` may be an array."""
+	Nu_D_avg = np.vectorize(sSphere.average_nusselt_number)(sphere.Ra, sphere.Pr)
+	h_avg = Nu_D_avg * sphere.fluid.k / sphere.D
+	return h_avg.to('W / (m ** 2 * K)')
+
 class Insulation:
 
 	class SurfaceType(Enum):
@@ -46,16 +65,73 @@ class Insulation:
 		self.FluidState_Change()
 
 	def FluidState_Change(self):
-		self._dew_point = Q_(HAPropsSI('D','T',self.t_amb.m,'P',self._pressure,'R',self.t_rh.to('').m),'degK')
+		dew_point, self._air = _air_state(self.t_amb.m, self.t_rh.to('').m, self._pressure)
+		self._dew_point = Q_(dew_point,'degK')
 		self._t_flm = (self.t_amb + self._dew_point) / 2
-		self._air = self._Air(T=self._t_flm, P=Q_(self._pressure, 'Pa'))
 		mean_temperature = (self.t_inside + self._t_flm)/2
-		self.k = INSULATION.ThermalConductivity(self.insulation, mean_temperature.to('degC').m)
+		self._k = INSULATION.ThermalConductivity(self.insulation, mean_temperature.to('degC').m)
 		if self.surface_Emissivity is None:
 			self.surface_Emissivity = INSULATION._property_table[self.insulation].Emissivity
-		self.hr = self.surface_Emissivity * Q_(Stefan_Boltzmann,'watt* m**-2 * K**-4') * (self.t_amb ** 4 - self._dew_point **4)/(self.t_amb - self._dew_point)
+		self._hr = self.surface_Emissivity * Q_(Stefan_Boltzmann,'watt* m**-2 * K**-4') * (self.t_amb ** 4 - self._dew_point **4)/(self.t_amb - self._dew_point)
+		self._stale = False
+
+	def _refresh(self):
+		"""Recomputes the derived air state if an input changed since the last use."""
+		if self._stale:
+			self.FluidState_Change()
+
+	def update(self, **changes) -> 'Insulation':
+		"""Applies several input changes at once. The derived air state (dew point,
+		film air properties, k and hr) is recomputed only once, on first use.
+
+		Parameters
+		----------
+		t_amb, t_rh, t_inside:
+			Same as the corresponding properties.
+		insulation:
+			Insulation material, key of `INSULATION._property_table`.
+		emissivity:
+			Surface emissivity of the insulation jacket.
+		"""
+		for key in changes:
+			if key not in ('t_amb', 't_rh', 't_inside', 'insulation', 'emissivity'):
+				raise TypeError(f'update() got an unexpected keyword argument {key!r}')
+		try:
+			for key, v in changes.items():
+				match key:
+					case 't_amb':
+						self._t_amb = v.to('degK')
+					case 't_rh':
+						self._t_rh = v
+					case 't_inside':
+						self._t_inside = v.to('degK')
+					case 'insulation':
+						self.insulation = v
+					case 'emissivity':
+						self.surface_Emissivity = v
+		finally:
+			# inputs applied before a failed conversion also invalidate the derived state
+			self._stale = True
+		return self
+
+	@contextmanager
+	def batch(self):
+		"""Context manager that groups property assignments; the derived air state
+		is recomputed once when the block exits.
+
+		```
+		with ins.batch():
+			ins.t_amb = Q_(35, 'degC')
+			ins.t_rh = Q_(80, '%')
+		```
+		"""
+		try:
+			yield self
+		finally:
+			self._refresh()
 
 	def CondensateInsulationThickness_Cylinder(self, surface_type:SurfaceType, od:Quantity)->Quantity|None:
+		self._refresh()
 
 		# Define the function to solve
 		def fsolve_thickness(t, d1):
@@ -79,6 +155,8 @@ class Insulation:
 				cylinder = hCylinder.Cylinder(D=od, L=Q_(1, 'm'), T_surf=self.t_amb, T_inf=self._dew_point, fluid=self._air)
 			case self.SurfaceType.Vertical_Cylinder:
 				cylinder = vCylinder.Cylinder(D=od, L=Q_(1, 'm'), T_surf=self.t_amb, T_inf=self._dew_point, fluid=self._air)
+			case self.SurfaceType.Sphere:
+				return self.CondensateInsulationThickness_Sphere(od)
 			case _:
 				return None
 		pipe_od = od.to('m').m
@@ -95,6 +173,7 @@ class Insulation:
 										 l:Quantity = Q_(1, 'm'), 
 										 w:Quantity|None=None, 
 										 config: str = configuration[1]) -> Quantity|None:
+		self._refresh()
 		match surface_type:
 			case self.SurfaceType.Horizontal_Plate:
 				plate = hPlate.Plate(L=l, W=w, T_surf=self.t_amb, T_inf=self._dew_point, fluid=self._air, configuration=config)
@@ -109,6 +188,7 @@ class Insulation:
 		return Q_(t_solution.m,'m').to('mm')
 
 	def ThermalInsulationThickness_Cylinder(self, surface_type:SurfaceType, od:Quantity, thk:Quantity)->Quantity|None:
+		self._refresh()
 
 		def SurfaceTemperature(t_surf):		
 			global q
@@ -136,6 +216,8 @@ class Insulation:
 				cylinder = hCylinder.Cylinder(D=total_od, L=Q_(1, 'm'), T_surf=self.t_amb, T_inf=self._dew_point, fluid=self._air)
 			case self.SurfaceType.Vertical_Cylinder:
 				cylinder = vCylinder.Cylinder(D=total_od, L=Q_(1, 'm'), T_surf=self.t_amb, T_inf=self._dew_point, fluid=self._air)
+			case self.SurfaceType.Sphere:
+				return self.ThermalInsulationThickness_Sphere(od, thk)
 			case _:
 				return None
 		mean_temperature = (self.t_amb + self.t_inside)/2
@@ -150,6 +232,7 @@ class Insulation:
 									  l:Quantity = Q_(1, 'm'), 
 									  w:Quantity|None=None, 
 									  config: str = configuration[0]) -> Quantity|None:
+		self._refresh()
 
 		def SurfaceThickness(t_surf):
 			global hs
@@ -179,13 +262,76 @@ class Insulation:
 		self.Surface = plate
 		return Q_(t.m + 0.5, 'degK').to('degC'), Q_(hs*(t.m - self.t_amb.m), 'W/m ** 2')
 
+	def CondensateInsulationThickness_Sphere(self, od:Quantity, max_iter:int = 50) -> Quantity:
+		"""Insulation thickness that keeps the surface of a spherical tank at the
+		dew point. `od` may be a single tank diameter or an array of diameters;
+		the thickness is returned with the same shape.
+
+		With r1 the tank radius and r2 the outer radius of the insulation, the
+		heat balance at the surface gives r2*(r2 - r1) = r1*(k/hs)*(T_dp - T_in)/(T_amb - T_dp),
+		which is solved for r2 while hs is updated for the growing outer diameter.
+		"""
+		self._refresh()
+		r1 = np.atleast_1d(od.to('m').m).astype(float) / 2
+		C = self.k * (self._dew_point.m - self.t_inside.m) / (self.t_amb.m - self._dew_point.m)
+		sphere = sSphere.Sphere(D=Q_(2*r1, 'm'), T_surf=self.t_amb, T_inf=self._dew_point, fluid=self._air)
+		r2 = r1.copy()
+		for _ in range(max_iter):
+			sphere.D = Q_(2*r2, 'm')
+			self.hc = _sphere_heat_trf_coeff(sphere)
+			hs = self.hc.m + self.hr.m
+			new_r2 = (r1 + np.sqrt(r1**2 + 4*r1*C/hs)) / 2
+			converged = np.all(np.abs(new_r2 - r2) < 1e-6)
+			r2 = new_r2
+			if converged:
+				break
+		self.Surface = sphere
+		t_solution = Q_(r2 - r1, 'm').to('mm')
+		return t_solution if np.ndim(od.m) else t_solution[0]
+
+	def ThermalInsulationThickness_Sphere(self, od:Quantity, thk:Quantity, max_iter:int = 100) -> tuple[Quantity, Quantity]:
+		"""Surface temperature and total heat loss of an insulated spherical tank.
+		`od` may be a single tank diameter or an array of diameters.
+
+		Returns
+		-------
+		A 2-tuple with the surface temperature (degC) and the heat loss (W) of each tank.
+		"""
+		self._refresh()
+		r1 = np.atleast_1d(od.to('m').m).astype(float) / 2
+		r2 = r1 + thk.to('m').m
+		t_amb = self.t_amb.m
+		t_in = self.t_inside.m
+		mean_temperature = (self.t_amb + self.t_inside)/2
+		self.k = INSULATION.ThermalConductivity(self.insulation, mean_temperature.to('degC').m)
+		R_ins = (1/r1 - 1/r2) / (4*np.pi*self.k)
+		A = 4*np.pi*r2**2
+		sphere = sSphere.Sphere(D=Q_(2*r2, 'm'), T_surf=self.t_amb, T_inf=self.t_amb, fluid=self._air)
+		t_surf = np.full_like(r1, mean_temperature.m)
+		for _ in range(max_iter):
+			# buoyancy only depends on the magnitude of the temperature difference
+			sphere.T_surf = Q_(t_amb + np.abs(t_surf - t_amb), 'degK')
+			self.hc = _sphere_heat_trf_coeff(sphere)
+			self.hr = self.surface_Emissivity * Q_(Stefan_Boltzmann,'watt* m**-2 * K**-4') * Q_((t_surf**2 + t_amb**2)*(t_surf + t_amb), 'degK ** 3')
+			hs = self.hc.m + self.hr.m
+			q = (t_in - t_amb) / (R_ins + 1/(hs*A))
+			new_t_surf = t_amb + q/(hs*A)
+			converged = np.all(np.abs(new_t_surf - t_surf) < 0.01)
+			t_surf = new_t_surf
+			if converged:
+				break
+		self.Surface = sphere
+		if np.ndim(od.m) == 0:
+			t_surf, q = t_surf[0], q[0]
+		return Q_(t_surf, 'degK').to('degC'), Q_(q, 'W')
+
 	@property
 	def t_amb(self) -> Quantity:
 		return self._t_amb
 	@t_amb.setter
 	def t_amb(self, v: Quantity) -> None:
 		self._t_amb = v.to('degK')
-		self.FluidState_Change()
+		self._stale = True
 
 	@property
 	def t_rh(self) -> Quantity:
@@ -193,7 +339,7 @@ class Insulation:
 	@t_rh.setter
 	def t_rh(self, v: Quantity) -> None:
 		self._t_rh = v
-		self.FluidState_Change()
+		self._stale = True
 
 	@property
 	def t_inside(self) -> Quantity:
@@ -201,5 +347,26 @@ class Insulation:
 	@t_inside.setter
 	def t_inside(self, v: Quantity) -> None:
 		self._t_inside = v.to('degK')
-		self.FluidState_Change()
+		self._stale = True
+
+	@property
+	def dew_point(self) -> Quantity:
+		self._refresh()
+		return self._dew_point
+
+	@property
+	def k(self) -> float:
+		self._refresh()
+		return self._k
+	@k.setter
+	def k(self, v: float) -> None:
+		self._k = v
+
+	@property
+	def hr(self) -> Quantity:
+		self._refresh()
+		return self._hr
+	@hr.setter
+	def hr(self, v: Quantity) -> None:
+		self._hr = v
 		
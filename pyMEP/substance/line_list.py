@@ -0,0 +1,128 @@
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pyMEP import Quantity
+from .general import PIPE
+from .insulation import Insulation
+
+Q_ = Quantity
+
+class PipingHeatLoss:
+	"""Heat loss rollup of insulated hot piping from a line list.
+
+	Each row of the line list describes one line with the columns
+	'System', 'NPS', 'Length' (m), 'Orientation' ('Horizontal' or 'Vertical'),
+	'T_fluid' (degC), 'Insulation', 'Thickness' (mm), 'T_amb' (degC) and
+	optionally 'RH' (%). 'NPS' is a nominal size of `PIPE.NPS` such as
+	'100 mm'; a plain number (e.g. 100) is read as that size in mm. Identical (NPS, orientation, temperatures, insulation,
+	thickness) combinations are solved only once; the unique solves are shared
+	through a memo that lives as long as the `PipingHeatLoss` object and are
+	distributed over a process pool.
+
+	```
+	calc = PipingHeatLoss(max_workers=8)
+	summary = calc.read_csv('line_list.csv', output='line_list_results.csv')
+	```
+	"""
+	key_columns: tuple = ('NPS', 'Orientation', 'T_fluid', 'Insulation', 'Thickness', 'T_amb', 'RH')
+	default_rh : float = 50
+
+	def __init__(self, max_workers:int|None = None, min_parallel:int = 8):
+		"""
+		Parameters
+		----------
+		max_workers:
+			Number of worker processes for the unique solves; `None` uses the
+			number of processors, 1 solves in the calling process.
+		min_parallel:
+			Below this number of new unique combinations the solves are done in
+			the calling process, as starting the pool would cost more.
+		"""
+		self.max_workers = max_workers
+		self.min_parallel = min_parallel
+		self._memo: dict[tuple, tuple[float, float]] = {}
+		# process pool shared by the chunks of `read_csv`
+		self._executor: ProcessPoolExecutor | None = None
+
+	def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+		"""Returns a copy of line list `df` with the columns 'T_surf' (degC),
+		'q' (W/m) and 'Q' (W, heat loss over the line length) added."""
+		df = df.copy()
+		if 'RH' not in df.columns:
+			df['RH'] = self.default_rh
+		df['RH'] = df['RH'].fillna(self.default_rh)
+		df['NPS'] = df['NPS'].map(_nps)
+		key_columns = list(self.key_columns)
+		keys = [tuple(k) for k in df[key_columns].drop_duplicates().itertuples(index=False)]
+		self._solve([k for k in keys if k not in self._memo])
+		results = pd.DataFrame([(*k, *self._memo[k]) for k in keys], columns=key_columns + ['T_surf', 'q'])
+		df = df.merge(results, on=key_columns, how='left')
+		df['Q'] = df['q'] * df['Length']
+		return df
+
+	def summary(self, df: pd.DataFrame) -> pd.DataFrame:
+		"""Total length and heat loss per system of a calculated line list."""
+		return df.groupby('System')[['Length', 'Q']].sum()
+
+	def read_csv(self, filepath:str, chunksize:int = 5000, output:str|None = None, **kwargs) -> pd.DataFrame:
+		"""Streams a line list CSV file in chunks of `chunksize` rows and returns
+		the heat loss per system. The row results are appended to the CSV file
+		`output` if given. Extra keyword arguments are passed to `pandas.read_csv`.
+		One process pool is used for all chunks; its workers are started when
+		the first chunk needs them.
+		"""
+		totals = []
+		if self.max_workers != 1:
+			self._executor = ProcessPoolExecutor(max_workers=self._workers)
+		try:
+			with pd.read_csv(filepath, chunksize=chunksize, **kwargs) as reader:
+				for i, chunk in enumerate(reader):
+					rows = self.calculate(chunk)
+					if output is not None:
+						rows.to_csv(output, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+					totals.append(self.summary(rows))
+		finally:
+			if self._executor is not None:
+				self._executor.shutdown()
+				self._executor = None
+		if not totals:
+			return pd.DataFrame(columns=['Length', 'Q'])
+		return pd.concat(totals).groupby(level=0).sum()
+
+	def _solve(self, keys: list[tuple]) -> None:
+		if not keys:
+			return
+		if self.max_workers == 1 or len(keys) < self.min_parallel:
+			results = map(_solve_line, keys)
+			self._memo.update(zip(keys, results))
+			return
+		chunksize = max(1, len(keys) // (4 * self._workers))
+		if self._executor is not None:
+			self._memo.update(zip(keys, self._executor.map(_solve_line, keys, chunksize=chunksize)))
+			return
+		with ProcessPoolExecutor(max_workers=self._workers) as executor:
+			self._memo.update(zip(keys, executor.map(_solve_line, keys, chunksize=chunksize)))
+
+	@property
+	def _workers(self) -> int:
+		return self.max_workers or os.cpu_count() or 1
+
+def _nps(nps) -> str:
+	"""Nominal pipe size as in `PIPE.NPS` ('100 mm'); numbers are taken as mm."""
+	try:
+		return f'{float(nps):g} mm'
+	except (TypeError, ValueError):
+		return str(nps).strip()
+
+def _solve_line(key: tuple) -> tuple[float, float]:
+	"""Surface temperature (degC) and heat loss per metre (W/m) of one unique line."""
+	nps, orientation, t_fluid, insulation, thickness, t_amb, rh = key
+	match str(orientation).strip().lower()[:1]:
+		case 'v':
+			surface_type = Insulation.SurfaceType.Vertical_Cylinder
+		case _:
+			surface_type = Insulation.SurfaceType.Horizontal_Cylinder
+	ins = Insulation(t_amb=Q_(float(t_amb), 'degC'), t_rh=Q_(float(rh), '%'), t_inside=Q_(float(t_fluid), 'degC'), insulation=insulation)
+	od = Q_(PIPE.OutsideDiameter(nps), 'mm')
+	t_surf, q = ins.ThermalInsulationThickness_Cylinder(surface_type, od, Q_(float(thickness), 'mm'))
+	return float(t_surf.m), float(q.m)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from pyMEP import Quantity
+from pyMEP.hvac.climatic import WeatherData, humidity_ratio
+from pyMEP.hvac.internal_heat_gains import VentilationHeatGain
+
+Q_ = Quantity
+
+def hourly_weather_data(T_wb=None):
+	return WeatherData.create_from_hourly_data('H', fi=Q_(13.7, 'deg'), L_loc=Q_(100.5, 'deg'), altitude=Q_(2, 'm'),
+		T_db=Q_(np.full(48, 30.0), 'degC'), T_wb=T_wb, taub=0.4, taud=2.3)
+
+def test_humidity_ratio_from_wet_bulb_and_relative_humidity():
+	W = humidity_ratio(30.0, 101325.0, T_wb=24.0)
+	assert W == pytest.approx(0.016336, abs=1e-6)		# ASHRAE Chapter 1 Eq. 33 and 35
+	# saturated air: the wet-bulb and the relative humidity route agree
+	assert humidity_ratio(25.0, 101325.0, T_wb=25.0) == pytest.approx(humidity_ratio(25.0, 101325.0, RH=1.0))
+
+def test_humidity_ratio_without_wet_bulb_or_relative_humidity():
+	with pytest.raises(ValueError, match='T_wb'):
+		humidity_ratio(30.0, 101325.0)
+
+def test_hourly_weather_data_without_wet_bulb():
+	wd = hourly_weather_data()
+	with pytest.raises(ValueError, match='T_wb'):
+		wd.W_array
+	ventilation = VentilationHeatGain('V', floor_area=Q_(100, 'm**2'), occupants=10)
+	ventilation.weather_data = wd
+	with pytest.raises(ValueError, match='T_wb'):
+		ventilation.update_cooling_load()
+	wd = hourly_weather_data(T_wb=Q_(np.full(48, 24.0), 'degC'))
+	assert np.allclose(wd.W_array, humidity_ratio(30.0, wd.pressure.to('Pa').m, T_wb=24.0))
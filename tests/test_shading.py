@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from pyMEP import Quantity
+from pyMEP.hvac.climatic import WeatherData, ReferenceDates
+from pyMEP.hvac.coolingload import RTS
+from pyMEP.hvac.external_heat_gains import Wall, Shading, WindowGroup, sunlit_fraction
+
+Q_ = Quantity
+
+@pytest.fixture(scope='module')
+def weather_data():
+	wd = WeatherData.create_from_climatic_design_data(ID='Atlanta USA', fi=Q_(33.640, 'deg'), L_loc=Q_(-84.4, 'deg'),
+		altitude=Q_(313, 'feet').to('m'), date=ReferenceDates.get_date_for('jul'), T_db_des=Q_(33.1, 'degC'),
+		T_db_rng=Q_(9.3, 'delta_degC'), T_wb_mc=Q_(23.2, 'degC'), T_wb_rng=Q_(3.4, 'delta_degC'), taub=0.515, taud=2.066, tz=-5)
+	wd.update_sun_position()
+	return wd
+
+def make_window(weather_data, psi, shading):
+	wall = Wall.creat_external_wall('Wall', weather_data=weather_data, surface_azimuth=Q_(psi, 'deg'), gross_area=Q_(10, 'm**2'),
+		U=Q_(0.5, 'W / (m**2 * K)'), CTS=[18, 57, 20, 4, 1] + [0]*19,
+		NS_RTS=RTS.rts_values(nrts=True, room_construction='Medium', carpet='With Carpet', glass='50%'))
+	wall.sigma = Q_(90, 'deg')
+	wall.add_window(id='Win', width=Q_(1.5, 'm'), height=Q_(1.0, 'm'), U=3.18, SC=0.9)
+	window = wall.windows['Win']
+	window.S_RTS = RTS.rts_values(nrts=False, room_construction='Medium', carpet='With Carpet', glass='50%')
+	window.SHGCd = [0.81, 0.80, 0.78, 0.73, 0.62, 0.39, 0]
+	window.SHGCh = 0.73
+	window.shading = shading
+	wall.update_cooling_load()
+	return wall, window
+
+def test_overhang_and_fin_geometry():
+	# β = 45°, γ = 0: tan Ω = 1, S_H = 0.5 m, the top 0.3 m of the 1 m high window is shaded
+	assert sunlit_fraction(np.array([45.0]), np.array([0.0]), 1.5, 1.0, 0.5, 0.2)[0] == pytest.approx(0.7)
+	# β = 45°, γ = 30°: S_W = 0.3 tan 30° and S_H = 0.5 tan 45° / cos 30°
+	S_W, S_H = 0.3 * np.tan(np.radians(30)), 0.5 / np.cos(np.radians(30))
+	expected = (1.5 - (S_W - 0.1)) * (1.0 - (S_H - 0.2)) / 1.5
+	assert sunlit_fraction(np.array([45.0]), np.array([30.0]), 1.5, 1.0, 0.5, 0.2, 0.3, 0.1)[0] == pytest.approx(expected)
+	# γ = -30° (sun on the other side) shades the same amount
+	assert sunlit_fraction(np.array([45.0]), np.array([-30.0]), 1.5, 1.0, 0.5, 0.2, 0.3, 0.1)[0] == pytest.approx(expected)
+	# overhang deep enough to shade the whole window
+	assert sunlit_fraction(np.array([60.0]), np.array([0.0]), 1.5, 1.0, 2.0, 0.0)[0] == 0.0
+
+def test_overhang_reduces_beam_gain(weather_data):
+	shading = Shading(overhang=Q_(0.5, 'm'), overhang_gap=Q_(0.2, 'm'), fin=Q_(0.3, 'm'), fin_gap=Q_(0.1, 'm'))
+	# east window: partly shaded in the morning
+	_, window = make_window(weather_data, -90, shading)
+	altitude = weather_data.position_df['Altitude'].to_numpy()
+	gamma = (weather_data.position_df['Azimuth'].to_numpy() + 90 + 180) % 360 - 180
+	sunny = (altitude > 0) & (np.abs(gamma) < 90)
+	beta, g = np.radians(altitude[sunny]), np.radians(gamma[sunny])
+	width = np.clip(1.5 - (0.3 * np.abs(np.tan(g)) - 0.1), 0, 1.5)
+	height = np.clip(1.0 - (0.5 * np.tan(beta) / np.cos(g) - 0.2), 0, 1.0)
+	fraction = window.sunlit_fraction()
+	assert np.allclose(fraction[sunny], width * height / 1.5)
+	partial = sunny & (fraction > 0) & (fraction < 1)
+	assert partial.any()
+	window.update_cooling_load()
+	shaded = window.window_SHG_df
+	window.shading = None
+	window.update_cooling_load()
+	unshaded = window.window_SHG_df
+	assert np.allclose(shaded['Etb(W/m2)'], unshaded['Etb(W/m2)'] * fraction)
+	assert np.allclose(shaded['qbHG'], unshaded['qbHG'] * fraction)
+	beam = partial & (unshaded['qbHG'].to_numpy() > 0)
+	assert beam.any()
+	assert np.all(shaded['qbHG'].to_numpy()[beam] < unshaded['qbHG'].to_numpy()[beam])
+	assert np.allclose(shaded['qdHG'], unshaded['qdHG'])
+
+@pytest.mark.parametrize('psi', [0, 90, 180, 270])
+def test_zero_depth_shading_is_fully_sunlit(weather_data, psi):
+	wall, window = make_window(weather_data, psi, Shading())
+	altitude = weather_data.position_df['Altitude'].to_numpy()
+	gamma = (weather_data.position_df['Azimuth'].to_numpy() - psi + 180) % 360 - 180
+	sunny = (altitude > 0) & (np.abs(gamma) < 90)
+	assert sunny.any()
+	fraction = window.sunlit_fraction()
+	assert np.all(fraction[sunny] == 1.0)
+	assert np.all(fraction[~sunny] == 0.0)
+	window.update_cooling_load()
+	shaded = np.asarray(window.cooling_load_df['TOTAL_CL'], dtype=float)
+	group = WindowGroup([window]).update_cooling_load(ns_rts=wall.NS_RTS, s_rts=window.S_RTS)
+	assert np.allclose(group['Win'], shaded)
+	window.shading = None
+	window.update_cooling_load()
+	unshaded = np.asarray(window.cooling_load_df['TOTAL_CL'], dtype=float)
+	assert np.allclose(shaded, unshaded)